@@ -0,0 +1,61 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.tasks.task1.config import ENGLISH_LETTER_FREQUENCIES
+from src.tasks.task1.letters import ALPHABET_SIZE, count_columns, text_to_letters
+
+DEFAULT_MAX_KEY_LENGTH = 40
+
+ENGLISH_INDEX_OF_COINCIDENCE = sum(frequency ** 2 for frequency in ENGLISH_LETTER_FREQUENCIES)
+RANDOM_INDEX_OF_COINCIDENCE = 1 / ALPHABET_SIZE
+
+# The share of the gap between the random and the English indices that a period may fall short by.
+INDEX_TOLERANCE = 0.25
+
+
+def get_indices_of_coincidence(counts: np.ndarray) -> np.ndarray:
+    totals = counts.sum(axis=-1)
+    coincidences = (counts * (counts - 1)).sum(axis=-1)
+    return coincidences / np.maximum(totals * (totals - 1), 1)
+
+
+def estimate_key_length(ciphertext: str) -> float:
+    counts = count_columns(text_to_letters(ciphertext), 1)
+    index = get_indices_of_coincidence(counts)[0]
+
+    # A text that is as uniform as a random one gives no estimate.
+    if index <= RANDOM_INDEX_OF_COINCIDENCE:
+        return float('inf')
+
+    return (ENGLISH_INDEX_OF_COINCIDENCE - RANDOM_INDEX_OF_COINCIDENCE) / (index - RANDOM_INDEX_OF_COINCIDENCE)
+
+
+def get_average_indices_of_coincidence(ciphertext: str, max_key_length: int = DEFAULT_MAX_KEY_LENGTH) -> np.ndarray:
+    if max_key_length <= 0:
+        raise ValueError('The maximum key length must be greater than zero.')
+
+    letters = text_to_letters(ciphertext)
+    return np.array([
+        get_indices_of_coincidence(count_columns(letters, key_length)).mean()
+        for key_length in range(1, max_key_length + 1)
+    ])
+
+
+def rank_key_lengths(
+    ciphertext: str,
+    top: int = 10,
+    max_key_length: Optional[int] = None,
+) -> List[Tuple[int, float]]:
+    indices = get_average_indices_of_coincidence(ciphertext, max_key_length or DEFAULT_MAX_KEY_LENGTH)
+
+    # Every multiple of the period gives the index of the language as well, so the periods whose indices are close
+    # to the English one (or to the best one for short texts) go first from the shortest. The rest follow by index.
+    scores = (indices - RANDOM_INDEX_OF_COINCIDENCE) / (ENGLISH_INDEX_OF_COINCIDENCE - RANDOM_INDEX_OF_COINCIDENCE)
+    threshold = min(1, scores.max()) - INDEX_TOLERANCE
+    close_key_lengths = [key_length for key_length in range(1, len(indices) + 1) if scores[key_length - 1] >= threshold]
+    other_key_lengths = sorted(
+        (key_length for key_length in range(1, len(indices) + 1) if scores[key_length - 1] < threshold),
+        key=lambda key_length: -indices[key_length - 1],
+    )
+    return [(key_length, float(indices[key_length - 1])) for key_length in close_key_lengths + other_key_lengths][:top]
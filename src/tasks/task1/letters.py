@@ -0,0 +1,34 @@
+from typing import Tuple
+
+import numpy as np
+
+from src.tasks.task1.config import ALPHABET
+
+ALPHABET_SIZE = len(ALPHABET)
+
+
+def text_to_codes(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode(), dtype=np.uint8)
+
+
+def get_letter_positions(codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    is_upper = np.logical_and(codes >= ord('A'), codes <= ord('Z'))
+    is_lower = np.logical_and(codes >= ord('a'), codes <= ord('z'))
+    positions = np.flatnonzero(np.logical_or(is_upper, is_lower))
+    bases = np.where(is_upper[positions], ord('A'), ord('a'))
+    return positions, bases
+
+
+def text_to_letters(text: str) -> np.ndarray:
+    codes = text_to_codes(text)
+    positions, bases = get_letter_positions(codes)
+    return (codes[positions] - bases).astype(np.intp)
+
+
+def count_columns(letters: np.ndarray, key_length: int) -> np.ndarray:
+    if key_length <= 0:
+        raise ValueError('The key length must be greater than zero.')
+
+    columns = np.arange(len(letters)) % key_length
+    counts = np.bincount(columns * ALPHABET_SIZE + letters, minlength=key_length * ALPHABET_SIZE)
+    return counts.reshape(key_length, ALPHABET_SIZE)
@@ -1,42 +1,223 @@
-from collections import Counter
-from math import floor, sqrt
-from typing import List, Set, Tuple
+import codecs
+import mmap
+from collections import Counter, defaultdict, deque
+from typing import Dict, Iterable, Iterator, List, Literal, Optional, Tuple
+
+import numpy as np
+
+from src.tasks.task1.friedman import DEFAULT_MAX_KEY_LENGTH, rank_key_lengths
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Streaming only sees the repeats that are at most this far apart, which is plenty for keys of practical lengths
+# and keeps the memory bounded by the window instead of the whole text.
+DEFAULT_MAX_DISTANCE = 1 << 14
+
+# The residue classes are counted with bincount while its array isn't much larger than the positions themselves.
+_BINCOUNT_RATIO = 4
 
 
 def get_lengths(ciphertext: str, segment_length: int) -> List[int]:
-    lengths = []
+    return list(iter_lengths([ciphertext], segment_length, max_distance=None))
+
+
+def count_divisors(lengths: Dict[int, int], max_key_length: Optional[int] = None) -> Counter:
+    if max_key_length is not None and max_key_length <= 0:
+        raise ValueError('The maximum key length must be greater than zero.')
+
+    if not lengths:
+        return Counter()
+
+    max_length = max(lengths)
+    histogram = [0] * (max_length + 1)
+    for length, number in lengths.items():
+        histogram[length] = number
+
+    # Every divisor collects the lengths that are its multiples, so each length is never factorized.
+    limit = max_length if max_key_length is None else min(max_key_length, max_length)
+    counter = Counter()
+    for divisor in range(1, limit + 1):
+        total = sum(histogram[divisor::divisor])
+        if total != 0:
+            counter[divisor] = total
+
+    return counter
+
+
+def group_positions(ciphertext: str, segment_length: int) -> List[List[int]]:
+    if segment_length <= 0:
+        raise ValueError('The segment length must be greater than zero.')
+
+    positions = defaultdict(list)
     for i in range(len(ciphertext) - segment_length + 1):
-        for j in range(i + 1, len(ciphertext) - segment_length + 1):
-            if ciphertext[i:(i + segment_length)] == ciphertext[j:(j + segment_length)]:
-                lengths.append(j - i)
+        positions[ciphertext[i:(i + segment_length)]].append(i)
 
-    return lengths
+    # A segment that occurs once has no repeats.
+    return [group for group in positions.values() if len(group) > 1]
 
 
-def get_divisors(number: int) -> Set[int]:
-    divisors = set()
-    for i in range(1, floor(sqrt(number) + 1)):
-        if number % i == 0:
-            divisors.add(i)
-            divisors.add(number // i)
+def _count_pairs(keys: np.ndarray, groups_number: int, divisor: int) -> int:
+    if groups_number * divisor <= _BINCOUNT_RATIO * len(keys):
+        sizes = np.bincount(keys)
+    else:
+        sizes = np.unique(keys, return_counts=True)[1]
 
-    return divisors
+    return int((sizes * (sizes - 1) // 2).sum())
 
 
-def find_possible_key_lengths(ciphertext: str, segment_length: int = 2, top: int = 10) -> List[Tuple[int, int]]:
-    lengths = get_lengths(ciphertext, segment_length)
+def count_group_divisors(groups: List[List[int]], max_key_length: int) -> Counter:
+    if max_key_length <= 0:
+        raise ValueError('The maximum key length must be greater than zero.')
 
+    if not groups:
+        return Counter()
+
+    # Two positions of a group are a multiple of the divisor apart exactly when they are equal modulo it, so every
+    # residue class of k positions adds C(k, 2) to the divisor without listing the pairs themselves.
+    positions = np.concatenate([np.asarray(group, dtype=np.int64) for group in groups])
+    group_indices = np.repeat(np.arange(len(groups), dtype=np.int64), [len(group) for group in groups])
     counter = Counter()
-    for length in lengths:
-        divisors = get_divisors(length)
-        counter.update(divisors)
+    for divisor in range(1, max_key_length + 1):
+        total = _count_pairs(group_indices * divisor + positions % divisor, len(groups), divisor)
+        if total != 0:
+            counter[divisor] = total
+
+    return counter
+
+
+def rank_divisors(counter: Counter, top: int) -> List[Tuple[int, int]]:
+    # Ties are broken by the smaller key length, so the ranking doesn't depend on the order of the counting.
+    return sorted(counter.items(), key=lambda pair: (-pair[1], pair[0]))[:top]
+
+
+def find_possible_key_lengths(
+    ciphertext: str,
+    segment_length: int = 2,
+    top: int = 10,
+    max_key_length: Optional[int] = None,
+    strategy: Literal['kasiski', 'friedman'] = 'kasiski',
+) -> List[Tuple[int, float]]:
+    if strategy == 'friedman':
+        return rank_key_lengths(ciphertext, top, max_key_length)
+
+    if strategy != 'kasiski':
+        raise ValueError(f'Unknown strategy: {strategy}.')
+
+    # The whole text is already in memory, so all the repeats are taken into account.
+    groups = group_positions(ciphertext, segment_length)
+    max_key_length = DEFAULT_MAX_KEY_LENGTH if max_key_length is None else max_key_length
+    return rank_divisors(count_group_divisors(groups, max_key_length), top)
+
+
+def _read_text_chunks(path: str, chunk_size: int) -> Iterator[str]:
+    with open(path, encoding='utf-8') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _read_mapped_chunks(path: str, chunk_size: int) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    with open(path, 'rb') as f:
+        # An empty file can't be memory-mapped.
+        if f.seek(0, 2) == 0:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            starts = range(0, len(mapped), chunk_size)
+            yield from (decoder.decode(mapped[start:(start + chunk_size)]) for start in starts)
+
+    yield decoder.decode(b'', final=True)
+
+
+def read_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, use_mmap: bool = False) -> Iterator[str]:
+    if chunk_size <= 0:
+        raise ValueError('The chunk size must be greater than zero.')
+
+    if use_mmap:
+        return _read_mapped_chunks(path, chunk_size)
+
+    return _read_text_chunks(path, chunk_size)
+
+
+def _forget_distant(group: deque, border: int) -> None:
+    while group and group[0] < border:
+        group.popleft()
+
+
+def _forget_distant_positions(positions: Dict[str, deque], border: int) -> None:
+    for segment in list(positions):
+        group = positions[segment]
+        _forget_distant(group, border)
+        if not group:
+            positions.pop(segment)
+
+
+def _iter_text_lengths(
+    text: str,
+    offset: int,
+    segment_length: int,
+    positions: Dict[str, deque],
+    max_distance: Optional[int],
+) -> Iterator[int]:
+    for i in range(len(text) - segment_length + 1):
+        position = offset + i
+        group = positions[text[i:(i + segment_length)]]
+
+        if max_distance is not None:
+            _forget_distant(group, position - max_distance)
+
+        yield from (position - previous for previous in group)
+        group.append(position)
+
+
+def iter_lengths(
+    chunks: Iterable[str],
+    segment_length: int,
+    max_distance: Optional[int] = DEFAULT_MAX_DISTANCE,
+) -> Iterator[int]:
+    if segment_length <= 0:
+        raise ValueError('The segment length must be greater than zero.')
+
+    if max_distance is not None and max_distance <= 0:
+        raise ValueError('The maximum distance must be greater than zero.')
+
+    positions = defaultdict(deque)
+    tail = ''
+    offset = 0
+    for chunk in chunks:
+        # Only the last (segment_length - 1) characters of the previous chunk are kept to catch the boundary segments.
+        text = tail + chunk
+        yield from _iter_text_lengths(text, offset, segment_length, positions, max_distance)
+
+        processed = max(len(text) - segment_length + 1, 0)
+        offset += processed
+        tail = text[processed:]
+
+        # Positions that are too far behind can't produce new lengths, so they are dropped to keep the memory bounded.
+        if max_distance is not None:
+            _forget_distant_positions(positions, offset - max_distance)
+
 
-    return counter.most_common(top)
+def find_possible_key_lengths_in_file(
+    path: str,
+    segment_length: int = 2,
+    top: int = 10,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    use_mmap: bool = False,
+    max_distance: Optional[int] = DEFAULT_MAX_DISTANCE,
+    max_key_length: Optional[int] = None,
+) -> List[Tuple[int, int]]:
+    chunks = read_chunks(path, chunk_size, use_mmap)
+    lengths = Counter(iter_lengths(chunks, segment_length, max_distance))
+    return rank_divisors(count_divisors(lengths, max_key_length), top)
 
 
 def main() -> None:
-    with open('input.txt') as f:
-        possible_key_lengths = find_possible_key_lengths(f.read(), 3)
+    possible_key_lengths = find_possible_key_lengths_in_file('input.txt', 3)
 
     for key_length, number in possible_key_lengths:
         print(f'{key_length}: {number}')
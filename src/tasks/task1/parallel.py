@@ -0,0 +1,75 @@
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+from src.tasks.task1.friedman import DEFAULT_MAX_KEY_LENGTH
+from src.tasks.task1.main import count_group_divisors, group_positions, rank_divisors
+
+Groups = List[List[int]]
+Task = Tuple[int, Groups, int]
+
+
+def split_groups(groups: Groups, shards: int) -> List[Groups]:
+    # The work of a group is proportional to its size, so every shard gets about the same number of positions.
+    shard_size = -(-sum(len(group) for group in groups) // shards)
+    parts = [[]]
+    size = 0
+    for group in groups:
+        if size >= shard_size:
+            parts.append([])
+            size = 0
+
+        parts[-1].append(group)
+        size += len(group)
+
+    return parts
+
+
+def _run_task(task: Task) -> Tuple[int, Counter]:
+    index, groups, max_key_length = task
+    return index, count_group_divisors(groups, max_key_length)
+
+
+def _split_into_tasks(
+    ciphertexts: Sequence[str],
+    segment_lengths: Sequence[int],
+    max_key_length: int,
+    shards: int,
+) -> List[Task]:
+    # The segments are grouped once here, and the workers only count the divisors of their groups.
+    tasks = []
+    for index, ciphertext in enumerate(ciphertexts):
+        for segment_length in segment_lengths:
+            groups = group_positions(ciphertext, segment_length)
+            tasks.extend((index, part, max_key_length) for part in split_groups(groups, shards) if part)
+
+    return tasks
+
+
+def find_possible_key_lengths_batch(
+    ciphertexts: Sequence[str],
+    segment_lengths: Sequence[int] = (2,),
+    top: int = 10,
+    max_key_length: Optional[int] = None,
+    processes: Optional[int] = None,
+    shards: Optional[int] = None,
+) -> List[List[Tuple[int, int]]]:
+    processes = processes or os.cpu_count() or 1
+    shards = shards or processes
+    if shards <= 0:
+        raise ValueError('The number of shards must be greater than zero.')
+
+    max_key_length = DEFAULT_MAX_KEY_LENGTH if max_key_length is None else max_key_length
+    if max_key_length <= 0:
+        raise ValueError('The maximum key length must be greater than zero.')
+
+    tasks = _split_into_tasks(ciphertexts, segment_lengths, max_key_length, shards)
+
+    # The divisor counts of all the groups and segment lengths of a ciphertext simply add up.
+    counters = [Counter() for _ in ciphertexts]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        for index, shard_counter in executor.map(_run_task, tasks):
+            counters[index].update(shard_counter)
+
+    return [rank_divisors(counter, top) for counter in counters]
@@ -0,0 +1,80 @@
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from src.tasks.task1.config import ALPHABET, ENGLISH_LETTER_FREQUENCIES
+from src.tasks.task1.letters import ALPHABET_SIZE, count_columns, get_letter_positions, text_to_codes, text_to_letters
+from src.tasks.task1.main import find_possible_key_lengths
+
+# _SHIFTED_LETTERS[shift][letter] is the ciphertext letter that the letter turns into under the shift.
+_SHIFTED_LETTERS = (np.arange(ALPHABET_SIZE)[None, :] + np.arange(ALPHABET_SIZE)[:, None]) % ALPHABET_SIZE
+
+
+class Solution(NamedTuple):
+    key: str
+    plaintext: str
+    score: float
+
+
+def score_shifts(counts: np.ndarray, frequencies: Tuple[float, ...] = ENGLISH_LETTER_FREQUENCIES) -> np.ndarray:
+    # The result has a chi-squared statistic for every column and every shift, normalized by the column size,
+    # so the scores of different key lengths can be compared with each other.
+    totals = np.maximum(counts.sum(axis=1), 1)[:, None, None]
+    observed = counts[:, _SHIFTED_LETTERS]
+    expected = totals * np.asarray(frequencies)[None, None, :]
+    return ((observed - expected) ** 2 / expected).sum(axis=2) / totals[:, :, 0]
+
+
+def _shorten_periodic_key(key: str) -> str:
+    for period in range(1, len(key) // 2 + 1):
+        if len(key) % period == 0 and key == key[:period] * (len(key) // period):
+            return key[:period]
+
+    return key
+
+
+def recover_key(ciphertext: str, key_length: int) -> Tuple[str, float]:
+    scores = score_shifts(count_columns(text_to_letters(ciphertext), key_length))
+    shifts = scores.argmin(axis=1)
+    key = ''.join(ALPHABET[shift] for shift in shifts)
+    return key, float(scores.min(axis=1).mean())
+
+
+def decrypt(ciphertext: str, key: str) -> str:
+    shifts = text_to_letters(key)
+    if len(shifts) != len(key) or not key:
+        raise ValueError('The key must consist of latin letters only.')
+
+    # Characters that are not latin letters are kept as is and don't consume the key.
+    codes = text_to_codes(ciphertext).copy()
+    positions, bases = get_letter_positions(codes)
+    key_shifts = shifts[np.arange(len(positions)) % len(shifts)]
+    codes[positions] = (codes[positions] - bases - key_shifts) % ALPHABET_SIZE + bases
+    return codes.tobytes().decode()
+
+
+def rank_solutions(ciphertext: str, key_lengths: List[int]) -> List[Solution]:
+    solutions = []
+    for key_length in key_lengths:
+        key, score = recover_key(ciphertext, key_length)
+        key = _shorten_periodic_key(key)
+        solutions.append(Solution(key, decrypt(ciphertext, key), score))
+
+    return sorted(solutions, key=lambda solution: solution.score)
+
+
+def crack(
+    ciphertext: str,
+    segment_length: int = 3,
+    candidates: int = 10,
+    max_key_length: Optional[int] = None,
+) -> Solution:
+    letters = text_to_letters(ciphertext)
+    if not letters.size:
+        raise ValueError('The ciphertext must contain latin letters.')
+
+    # Only the letters consume the key, so the repeats are searched without the other characters.
+    normalized_ciphertext = (letters + ord('a')).astype(np.uint8).tobytes().decode()
+    possible_key_lengths = find_possible_key_lengths(normalized_ciphertext, segment_length, candidates, max_key_length)
+    key_lengths = [key_length for key_length, _ in possible_key_lengths] or [1]
+    return rank_solutions(ciphertext, key_lengths)[0]
@@ -0,0 +1,37 @@
+import os
+import sys
+import timeit
+
+sys.path.append('')
+sys.path.append('../../..')
+
+from src.tasks.task2.cipher import DES, TripleDES
+
+_TEXT_LENGTH = 1 << 15
+_REPEATS = 5
+
+_KEYS = ('133457799BBCDF', '0E329232EA6D0D', '73AB5D79C6D0F1')
+
+
+def measure_speed(cipher, text: bytes) -> float:
+    seconds = min(timeit.repeat(lambda: cipher.encrypt(text), number=1, repeat=_REPEATS))
+    return len(text) / seconds
+
+
+def main():
+    text = os.urandom(_TEXT_LENGTH)
+    ciphers = {
+        'DES': DES(_KEYS[0]),
+        '3DES (EDE2)': TripleDES(_KEYS[:2]),
+        '3DES (EDE3)': TripleDES(_KEYS),
+    }
+
+    des_speed = None
+    for name, cipher in ciphers.items():
+        speed = measure_speed(cipher, text)
+        des_speed = des_speed or speed
+        print(f'{name}: {speed / 1024:.1f} KiB/s, {des_speed / speed:.2f}x the time of DES')
+
+
+if __name__ == '__main__':
+    main()
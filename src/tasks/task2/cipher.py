@@ -0,0 +1,48 @@
+from typing import Sequence
+
+from src.tasks.task2.utils.des import process_block, process_block_chain, process_bytes, process_bytes_chain
+from src.tasks.task2.utils.key_utils import get_key_schedule
+
+
+class DES:
+    block_size = 8
+
+    def __init__(self, key: str):
+        self.key_schedule = get_key_schedule(key)
+
+    def encrypt_block(self, block: int) -> int:
+        return process_block(block, self.key_schedule.encryption_keys)
+
+    def decrypt_block(self, block: int) -> int:
+        return process_block(block, self.key_schedule.decryption_keys)
+
+    def encrypt(self, text: bytes) -> bytes:
+        return process_bytes(text, self.key_schedule.encryption_keys)
+
+    def decrypt(self, text: bytes) -> bytes:
+        return process_bytes(text, self.key_schedule.decryption_keys)
+
+
+class TripleDES:
+    block_size = 8
+
+    def __init__(self, keys: Sequence[str]):
+        # Two keys give the EDE2 variant (K1, K2, K1), three keys give EDE3 (K1, K2, K3).
+        if len(keys) not in {2, 3}:
+            raise ValueError('Triple DES needs two or three keys.')
+
+        first, second, third = [get_key_schedule(key) for key in (*keys, keys[0])[:3]]
+        self.encryption_keys = (first.encryption_keys, second.decryption_keys, third.encryption_keys)
+        self.decryption_keys = (third.decryption_keys, second.encryption_keys, first.decryption_keys)
+
+    def encrypt_block(self, block: int) -> int:
+        return process_block_chain(block, self.encryption_keys)
+
+    def decrypt_block(self, block: int) -> int:
+        return process_block_chain(block, self.decryption_keys)
+
+    def encrypt(self, text: bytes) -> bytes:
+        return process_bytes_chain(text, self.encryption_keys)
+
+    def decrypt(self, text: bytes) -> bytes:
+        return process_bytes_chain(text, self.decryption_keys)
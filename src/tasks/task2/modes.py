@@ -0,0 +1,68 @@
+import math
+import os
+from typing import Optional
+
+from src.tasks.task2.cipher import DES
+from src.utils.modes import MODES, Mode, StreamCipher, decrypt_cbc, encrypt_cbc, pad, process_ctr, unpad
+
+
+class DESCipher(StreamCipher):
+    def __init__(
+        self,
+        key: str,
+        mode: Mode = 'ECB',
+        iv: Optional[bytes] = None,
+        *,
+        is_decryption: bool = False,
+    ):
+        if mode not in MODES:
+            raise ValueError(f'Unknown mode: {mode}.')
+
+        self.cipher = DES(key)
+        super().__init__(self.cipher.block_size)
+        self.mode = mode
+        self.is_decryption = is_decryption
+
+        if mode == 'ECB' and iv is not None:
+            raise ValueError('ECB mode does not use an IV.')
+
+        if mode != 'ECB' and iv is None:
+            iv = os.urandom(self.block_size)
+
+        if iv is not None and len(iv) != self.block_size:
+            raise ValueError(f'The IV must be {self.block_size} bytes long.')
+
+        self.iv = iv
+        self._chaining_value = int.from_bytes(iv or b'', byteorder='big')
+        self._processed_blocks = 0
+
+    def _keeps_last_block(self) -> bool:
+        # A padded decryption must keep the last block until finalize, as it may contain the padding.
+        return self.is_decryption and self.mode != 'CTR'
+
+    def _finalize(self, tail: bytes) -> bytes:
+        if self.mode == 'CTR':
+            return self._process(tail)
+
+        if self.is_decryption:
+            return unpad(self._process(tail), self.block_size)
+
+        return self._process(pad(tail, self.block_size))
+
+    def _process(self, text: bytes) -> bytes:
+        if self.mode == 'CTR':
+            processed_text = process_ctr(self.cipher, text, self._chaining_value, self._processed_blocks)
+            self._processed_blocks += math.ceil(len(text) / self.block_size)
+            return processed_text
+
+        if self.mode == 'ECB':
+            return self.cipher.decrypt(text) if self.is_decryption else self.cipher.encrypt(text)
+
+        if self.is_decryption:
+            processed_text = decrypt_cbc(self.cipher, text, self._chaining_value)
+            self._chaining_value = int.from_bytes(text[-self.block_size:], byteorder='big')
+        else:
+            processed_text = encrypt_cbc(self.cipher, text, self._chaining_value)
+            self._chaining_value = int.from_bytes(processed_text[-self.block_size:], byteorder='big')
+
+        return processed_text
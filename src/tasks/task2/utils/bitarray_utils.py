@@ -35,6 +35,10 @@ def split_by_block_length(bits: bitarray, block_length: int) -> List[bitarray]:
     return blocks
 
 
+def pad_with_zeros(bits: bitarray, block_length: int) -> bitarray:
+    return bits + zeros(-len(bits) % block_length)
+
+
 def permute(block: bitarray, permutation_table: tuple, bias: int = 1) -> bitarray:
     if min(permutation_table) - bias < 0 or max(permutation_table) - bias >= len(block):
         raise ValueError(
@@ -0,0 +1,128 @@
+from functools import lru_cache
+from typing import Sequence
+
+import numpy as np
+
+from src.tasks.task2.config import (
+    BASIC_CONVERSION_TABLES,
+    EXPANSION_TABLE,
+    FINAL_PERMUTATION,
+    INITIAL_PERMUTATION,
+    REVERSED_INITIAL_PERMUTATION,
+)
+from src.tasks.task2.utils.key_utils import get_key_schedule
+from src.utils.tables import get_table, register_table
+
+TRUTH_TABLE = 'des-truth-table'
+
+# Blocks are processed in batches to keep the intermediate arrays small (~24 bytes of minterms per block and round).
+BATCH_SIZE = 1 << 16
+
+_LANES = 64
+_ALL_ONES = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def _to_indices(permutation_table: tuple, bias: int = 1) -> np.ndarray:
+    return np.array(permutation_table) - bias
+
+
+# In the bitsliced form a permutation is just a reordering of the bit planes.
+_INITIAL_PERMUTATION = _to_indices(INITIAL_PERMUTATION)
+_REVERSED_INITIAL_PERMUTATION = _to_indices(REVERSED_INITIAL_PERMUTATION)
+_EXPANSION = _to_indices(EXPANSION_TABLE)
+_FINAL_PERMUTATION = _to_indices(FINAL_PERMUTATION)
+
+
+@register_table(TRUTH_TABLE, 'B')
+def _build_truth_table() -> Sequence[Sequence[int]]:
+    # The row (4 * i + j) holds the j-th output bit (the most significant first) of the i-th S-box for every input.
+    # The 6-bit input b1..b6 selects the row b1b6 and the column b2b3b4b5.
+    truth_table = []
+    for table in BASIC_CONVERSION_TABLES:
+        outputs = [table[((bits & 0x20) >> 4) | (bits & 1)][(bits >> 1) & 0xF] for bits in range(64)]
+        truth_table.extend([(output >> shift) & 1 for output in outputs] for shift in (3, 2, 1, 0))
+
+    return truth_table
+
+
+@lru_cache(maxsize=None)
+def _get_truth_table() -> np.ndarray:
+    return np.array(get_table(TRUTH_TABLE), dtype=np.uint64).reshape(8, 4, 64)
+
+
+def to_bitslices(blocks: np.ndarray) -> np.ndarray:
+    # The result has one row per bit of the block (the most significant bit first); the j-th bit of the w-th word
+    # of a row belongs to the block (64 * w + j).
+    padding = np.zeros(-len(blocks) % _LANES, dtype=np.uint64)
+    padded_blocks = np.concatenate([blocks, padding]).astype('>u8')
+    bits = np.unpackbits(padded_blocks.view(np.uint8).reshape(-1, 8), axis=1)
+    bitslices = np.packbits(np.ascontiguousarray(bits.T), axis=1, bitorder='little')
+    return bitslices.view('<u8').astype(np.uint64)
+
+
+def from_bitslices(bitslices: np.ndarray, blocks_number: int) -> np.ndarray:
+    bits = np.unpackbits(bitslices.astype('<u8').view(np.uint8), axis=1, bitorder='little')
+    blocks = np.packbits(np.ascontiguousarray(bits.T), axis=1).view('>u8').reshape(-1)
+    return blocks[:blocks_number].astype(np.uint64)
+
+
+def _to_key_masks(key: int) -> np.ndarray:
+    bits = (key >> np.arange(47, -1, -1, dtype=np.uint64)) & np.uint64(1)
+    return np.where(bits == 1, _ALL_ONES, np.uint64(0))[:, None]
+
+
+def _get_minterms(extended_block: np.ndarray) -> np.ndarray:
+    # literals[i][k][1] is the k-th input bit of the i-th S-box and literals[i][k][0] is its inversion.
+    words_number = extended_block.shape[1]
+    literals = extended_block.reshape(8, 6, 1, words_number)
+    literals = np.concatenate([~literals, literals], axis=2)
+
+    # The minterms of the bit pairs (b1, b2), (b3, b4), (b5, b6) are combined into the 64 minterms of the input,
+    # so minterms[i][bits] is set exactly in the lanes where the input of the i-th S-box equals bits.
+    pairs = (literals[:, 0::2, :, None] & literals[:, 1::2, None, :]).reshape(8, 3, 4, words_number)
+    minterms = pairs[:, 0, :, None, None] & pairs[:, 1, None, :, None] & pairs[:, 2, None, None, :]
+    return minterms.reshape(8, 64, words_number)
+
+
+def feistel_function(block: np.ndarray, key_mask: np.ndarray) -> np.ndarray:
+    # Every S-box is evaluated as a two-level boolean circuit: its input bits are ANDed into minterms and every
+    # output bit is the OR of the minterms where it is one. Exactly one minterm is set in every lane, so the OR
+    # is computed as a product with the 0/1 truth table.
+    minterms = _get_minterms(block[_EXPANSION] ^ key_mask)
+    encrypted_block = np.matmul(_get_truth_table(), minterms).reshape(32, block.shape[1])
+    return encrypted_block[_FINAL_PERMUTATION]
+
+
+def process_bitslices(bitslices: np.ndarray, keys: Sequence[int]) -> np.ndarray:
+    shuffled_bitslices = bitslices[_INITIAL_PERMUTATION]
+    left_part, right_part = shuffled_bitslices[:32], shuffled_bitslices[32:]
+
+    for key in keys:
+        left_part, right_part = right_part, left_part ^ feistel_function(right_part, _to_key_masks(key))
+
+    return np.concatenate([right_part, left_part])[_REVERSED_INITIAL_PERMUTATION]
+
+
+def process_blocks(blocks: np.ndarray, keys: Sequence[int]) -> np.ndarray:
+    blocks = np.asarray(blocks, dtype=np.uint64).reshape(-1)
+
+    processed_blocks = [np.empty(0, dtype=np.uint64)]
+    for start in range(0, len(blocks), BATCH_SIZE):
+        batch = blocks[start:(start + BATCH_SIZE)]
+        processed_bitslices = process_bitslices(to_bitslices(batch), keys)
+        processed_blocks.append(from_bitslices(processed_bitslices, len(batch)))
+
+    return np.concatenate(processed_blocks)
+
+
+def encrypt_blocks(blocks: np.ndarray, key: str) -> np.ndarray:
+    return process_blocks(blocks, get_key_schedule(key).encryption_keys)
+
+
+def decrypt_blocks(blocks: np.ndarray, key: str) -> np.ndarray:
+    return process_blocks(blocks, get_key_schedule(key).decryption_keys)
+
+
+def generate_ctr_keystream(key: str, nonce: int, start_block: int, blocks_number: int) -> np.ndarray:
+    counters = np.arange(blocks_number, dtype=np.uint64) + np.uint64((nonce + start_block) % (1 << 64))
+    return encrypt_blocks(counters, key)
@@ -0,0 +1,138 @@
+from typing import Sequence, Tuple
+
+from src.tasks.task2.config import (
+    BASIC_CONVERSION_TABLES,
+    EXPANSION_TABLE,
+    FINAL_PERMUTATION,
+    INITIAL_PERMUTATION,
+    REVERSED_INITIAL_PERMUTATION,
+)
+from src.utils.tables import get_table, register_table
+
+BLOCK_LENGTH = 64
+HALF_BLOCK_MASK = 0xFFFFFFFF
+
+ByteTables = Tuple[Tuple[int, ...], ...]
+
+INITIAL_PERMUTATION_TABLES = 'des-initial-permutation'
+REVERSED_INITIAL_PERMUTATION_TABLES = 'des-reversed-initial-permutation'
+EXPANSION_TABLES = 'des-expansion'
+SP_TABLES = 'des-sp'
+
+
+def build_permutation_tables(permutation_table: tuple, input_length: int, bias: int = 1) -> ByteTables:
+    if input_length % 8 != 0:
+        raise ValueError('The input length must be a multiple of 8.')
+
+    if min(permutation_table) - bias < 0 or max(permutation_table) - bias >= input_length:
+        raise ValueError(f'The values in the table of permutations must be in the range from 0 to {input_length - 1}.')
+
+    # tables[i][byte] is the permuted value of an input that has only the i-th byte (counting from the most
+    # significant one) set to byte, so a permutation becomes one lookup per input byte.
+    output_length = len(permutation_table)
+    tables = [[0] * 256 for _ in range(input_length // 8)]
+    for output_position, input_position in enumerate(permutation_table):
+        byte_index, bit_index = divmod(input_position - bias, 8)
+        output_bit = 1 << (output_length - 1 - output_position)
+        for byte in range(256):
+            if byte & (0x80 >> bit_index):
+                tables[byte_index][byte] |= output_bit
+
+    return tuple(tuple(table) for table in tables)
+
+
+def permute(block: int, tables: ByteTables) -> int:
+    permuted_block = 0
+    shift = len(tables) * 8
+    for table in tables:
+        shift -= 8
+        permuted_block |= table[(block >> shift) & 0xFF]
+
+    return permuted_block
+
+
+def build_sp_tables(final_permutation_tables: ByteTables) -> ByteTables:
+    # sp_tables[i][six_bits] is the output of the i-th S-box already moved to its place in the 32-bit block
+    # and passed through the final permutation P. The 6-bit input b1..b6 selects the row b1b6 and the column b2b3b4b5.
+    sp_tables = []
+    for index, table in enumerate(BASIC_CONVERSION_TABLES):
+        shift = 28 - 4 * index
+        sp_tables.append(tuple(
+            permute(table[((bits & 0x20) >> 4) | (bits & 1)][(bits >> 1) & 0xF] << shift, final_permutation_tables)
+            for bits in range(64)
+        ))
+
+    return tuple(sp_tables)
+
+
+@register_table(INITIAL_PERMUTATION_TABLES, 'Q')
+def _build_initial_permutation_tables() -> ByteTables:
+    return build_permutation_tables(INITIAL_PERMUTATION, 64)
+
+
+@register_table(REVERSED_INITIAL_PERMUTATION_TABLES, 'Q')
+def _build_reversed_initial_permutation_tables() -> ByteTables:
+    return build_permutation_tables(REVERSED_INITIAL_PERMUTATION, 64)
+
+
+@register_table(EXPANSION_TABLES, 'Q')
+def _build_expansion_tables() -> ByteTables:
+    return build_permutation_tables(EXPANSION_TABLE, 32)
+
+
+@register_table(SP_TABLES, 'I')
+def _build_sp_tables() -> ByteTables:
+    return build_sp_tables(build_permutation_tables(FINAL_PERMUTATION, 32))
+
+
+def feistel_function(block: int, key: int) -> int:
+    return _feistel_function(block, key, get_table(EXPANSION_TABLES), get_table(SP_TABLES))
+
+
+def _feistel_function(block: int, key: int, expansion_tables: ByteTables, sp: ByteTables) -> int:
+    # Eight lookups into the combined S-box and P tables, one per 6-bit group of the expanded block.
+    e = permute(block, expansion_tables) ^ key
+    first_half = sp[0][e >> 42] | sp[1][(e >> 36) & 0x3F] | sp[2][(e >> 30) & 0x3F] | sp[3][(e >> 24) & 0x3F]
+    second_half = sp[4][(e >> 18) & 0x3F] | sp[5][(e >> 12) & 0x3F] | sp[6][(e >> 6) & 0x3F] | sp[7][e & 0x3F]
+    return first_half | second_half
+
+
+def _run_rounds(left_part: int, right_part: int, keys: Sequence[int]) -> Tuple[int, int]:
+    # The tables are looked up once per pass rather than once per round.
+    expansion_tables, sp = get_table(EXPANSION_TABLES), get_table(SP_TABLES)
+    for key in keys:
+        left_part, right_part = right_part, left_part ^ _feistel_function(right_part, key, expansion_tables, sp)
+
+    return right_part, left_part
+
+
+def process_block(block: int, keys: Sequence[int]) -> int:
+    return process_block_chain(block, (keys,))
+
+
+def process_block_chain(block: int, key_sequences: Sequence[Sequence[int]]) -> int:
+    # Consecutive DES passes are fused: the final permutation of a pass and the initial permutation of the next one
+    # cancel each other out, so only the swap of the halves remains between the passes.
+    block = permute(block, get_table(INITIAL_PERMUTATION_TABLES))
+    left_part, right_part = block >> 32, block & HALF_BLOCK_MASK
+
+    for keys in key_sequences:
+        left_part, right_part = _run_rounds(left_part, right_part, keys)
+
+    return permute((left_part << 32) | right_part, get_table(REVERSED_INITIAL_PERMUTATION_TABLES))
+
+
+def process_bytes(text: bytes, keys: Sequence[int]) -> bytes:
+    return process_bytes_chain(text, (keys,))
+
+
+def process_bytes_chain(text: bytes, key_sequences: Sequence[Sequence[int]]) -> bytes:
+    if len(text) % 8 != 0:
+        raise ValueError('The length of the text must be a multiple of the block size.')
+
+    processed_text = bytearray()
+    for start in range(0, len(text), 8):
+        block = int.from_bytes(text[start:(start + 8)], byteorder='big')
+        processed_text += process_block_chain(block, key_sequences).to_bytes(8, byteorder='big')
+
+    return bytes(processed_text)
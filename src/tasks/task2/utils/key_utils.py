@@ -1,10 +1,19 @@
-from typing import Callable, List, Literal, Tuple
+from functools import lru_cache
+from typing import Callable, List, Literal, NamedTuple, Tuple
 
 from bitarray import bitarray
-from bitarray.util import parity
+from bitarray.util import ba2int, int2ba, parity
 
-from src.tasks.task2.config import CYCLIC_SHIFT, SUBKEY_PERMUTATION
-from src.tasks.task2.utils.bitarray_utils import permute, split_by_block_length
+from src.tasks.task2.config import CYCLIC_SHIFT, KEY_INITIAL_PERMUTATION, SUBKEY_PERMUTATION
+from src.tasks.task2.utils.bitarray_utils import convert_hex_key_to_bitarray, permute, split_by_block_length
+
+KEY_LENGTH = 56
+KEY_SCHEDULE_CACHE_SIZE = 256
+
+
+class KeySchedule(NamedTuple):
+    encryption_keys: Tuple[int, ...]
+    decryption_keys: Tuple[int, ...]
 
 
 def generate_oddity_bit(block: bitarray) -> int:
@@ -55,3 +64,28 @@ def generate_subkeys(key: bitarray) -> List[bitarray]:
         subkeys.append(permute(c_block + d_block, SUBKEY_PERMUTATION))
 
     return subkeys
+
+
+def normalize_key(key: str) -> int:
+    return ba2int(convert_hex_key_to_bitarray(key, length=KEY_LENGTH))
+
+
+@lru_cache(maxsize=KEY_SCHEDULE_CACHE_SIZE)
+def _expand_key(normalized_key: int) -> KeySchedule:
+    extended_key = add_additional_bits(int2ba(normalized_key, length=KEY_LENGTH))
+    shuffled_key = permute(extended_key, KEY_INITIAL_PERMUTATION)
+    subkeys = tuple(map(ba2int, generate_subkeys(shuffled_key)))
+    return KeySchedule(subkeys, subkeys[::-1])
+
+
+def get_key_schedule(key: str) -> KeySchedule:
+    # Keys that differ only in the representation (e.g. leading zeros) share the cached schedule.
+    return _expand_key(normalize_key(key))
+
+
+def get_key_schedule_cache_info():
+    return _expand_key.cache_info()
+
+
+def clear_key_schedule_cache() -> None:
+    _expand_key.cache_clear()
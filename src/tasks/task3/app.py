@@ -8,26 +8,27 @@ sys.path.append('')
 sys.path.append('../../..')
 
 from src.tasks.task3.main import decode, encode
+from src.tasks.task3.utils.key_utils import KEY_LENGTHS
 
 
-def show_encoder():
+def show_encoder(key_length: int):
     text = st.text_input('Text:')
-    key = st.text_input('Key:', max_chars=32, key='encoder_key')
+    key = st.text_input('Key:', max_chars=key_length // 4, key='encoder_key')
 
     if key != '' and not re.match('^[0-9a-fA-F]+$', key):
         st.error('Key must be in hexadecimal.')
 
     if text != '' and key != '' and re.match('^[0-9a-fA-F]+$', key):
-        encrypted_text = encode(text, key)
+        encrypted_text = encode(text, key, key_length)
         st.markdown('**Encrypted text**')
         st.markdown(ba2hex(encrypted_text))
 
     return key
 
 
-def show_decoder(key: str):
+def show_decoder(key: str, key_length: int):
     encrypted_text = st.text_input('Encrypted text:')
-    key = st.text_input('Key:', max_chars=32, value=key, key='decoder_key')
+    key = st.text_input('Key:', max_chars=key_length // 4, value=key, key='decoder_key')
 
     if encrypted_text != '' and not re.match('^[0-9a-fA-F]+$', encrypted_text):
         st.error('Text must be in hexadecimal.')
@@ -38,22 +39,23 @@ def show_decoder(key: str):
         st.stop()
 
     if encrypted_text != '' and key != '':
-        decrypted_text = decode(hex2ba(encrypted_text), key)
+        decrypted_text = decode(hex2ba(encrypted_text), key, key_length)
         st.markdown('**Decrypted text**')
         st.markdown(decrypted_text.tobytes().decode(errors='replace').strip('\x00'))
 
 
 def main():
     st.header('Advanced Encryption Standard (AES)')
+    key_length = st.selectbox('Key length (bits):', KEY_LENGTHS)
 
     left_column, right_column = st.columns(2)
     with left_column:
         st.subheader('Encoder')
-        key = show_encoder()
+        key = show_encoder(key_length)
 
     with right_column:
         st.subheader('Decoder')
-        show_decoder(key)
+        show_decoder(key, key_length)
 
 
 if __name__ == '__main__':
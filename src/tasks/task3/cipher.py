@@ -0,0 +1,31 @@
+from src.tasks.task3.utils import fast_aes
+from src.tasks.task3.utils.key_utils import get_key_schedule
+
+
+class AES:
+    block_size = 16
+
+    def __init__(self, key: str, key_length: int = 128):
+        self.key_schedule = get_key_schedule(key, key_length)
+
+    def encrypt_block(self, block: int) -> int:
+        return fast_aes.encrypt_block(block, self.key_schedule.encryption_keys)
+
+    def decrypt_block(self, block: int) -> int:
+        return fast_aes.decrypt_block(block, self.key_schedule.decryption_keys)
+
+    def encrypt(self, text: fast_aes.Buffer) -> bytes:
+        output = bytearray(len(memoryview(text).cast('B')))
+        self.encrypt_into(text, output)
+        return bytes(output)
+
+    def decrypt(self, text: fast_aes.Buffer) -> bytes:
+        output = bytearray(len(memoryview(text).cast('B')))
+        self.decrypt_into(text, output)
+        return bytes(output)
+
+    def encrypt_into(self, text: fast_aes.Buffer, output: fast_aes.WritableBuffer) -> None:
+        fast_aes.process_buffer(text, output, fast_aes.encrypt_words, self.key_schedule.encryption_keys)
+
+    def decrypt_into(self, text: fast_aes.Buffer, output: fast_aes.WritableBuffer) -> None:
+        fast_aes.process_buffer(text, output, fast_aes.decrypt_words, self.key_schedule.decryption_keys)
@@ -1,69 +1,24 @@
-from bitarray import bitarray
-
-from src.tasks.task3.utils.aes import (
-    add_round_key,
-    bits_to_block,
-    block_to_bits,
-    generate_keys,
-    mix_columns,
-    shift_rows,
-    sub_bytes,
-)
-from src.tasks.task3.utils.bitarray_utils import (
-    convert_hex_key_to_bitarray,
-    convert_text_to_bitarray,
-    split_by_block_length,
-)
-
-
-def encode(text: str, key: str):
-    bitstring = convert_text_to_bitarray(text)
-    blocks = split_by_block_length(bitstring, 128)
-    states = list(map(bits_to_block, blocks))
-
-    bitkey = convert_hex_key_to_bitarray(key, length=128)
-    keys = generate_keys(bits_to_block(bitkey))
+from typing import Callable
 
-    encrypted_text = bitarray()
-    for state in states:
-        add_round_key(state, keys[0])
-
-        for j in range(1, 10):
-            sub_bytes(state)
-            state = shift_rows(state)
-            mix_columns(state)
-            add_round_key(state, keys[j])
-
-        sub_bytes(state)
-        state = shift_rows(state)
-        add_round_key(state, keys[-1])
-
-        encrypted_text += block_to_bits(state)
-
-    return encrypted_text
+from bitarray import bitarray
 
+from src.tasks.task3.cipher import AES
+from src.tasks.task3.utils.bitarray_utils import convert_text_to_bitarray, pad_with_zeros
 
-def decode(bitstring: bitarray, key: str) -> bitarray:
-    blocks = split_by_block_length(bitstring, 128)
-    states = list(map(bits_to_block, blocks))
 
-    bitkey = convert_hex_key_to_bitarray(key, length=128)
-    keys = generate_keys(bits_to_block(bitkey))[::-1]
+def _process(bitstring: bitarray, process_into: Callable[[bytearray, bytearray], None]) -> bitarray:
+    # The bitarray is only an adapter: the text is processed in place as bytes.
+    text = bytearray(pad_with_zeros(bitstring, 128).tobytes())
+    process_into(text, text)
 
-    decrypted_text = bitarray()
-    for state in states:
-        add_round_key(state, keys[0])
+    processed_text = bitarray()
+    processed_text.frombytes(bytes(text))
+    return processed_text
 
-        for j in range(1, 10):
-            state = shift_rows(state, is_inverse=True)
-            sub_bytes(state, is_inverse=True)
-            add_round_key(state, keys[j])
-            mix_columns(state, is_inverse=True)
 
-        state = shift_rows(state, is_inverse=True)
-        sub_bytes(state, is_inverse=True)
-        add_round_key(state, keys[-1])
+def encode(text: str, key: str, key_length: int = 128):
+    return _process(convert_text_to_bitarray(text), AES(key, key_length).encrypt_into)
 
-        decrypted_text += block_to_bits(state)
 
-    return decrypted_text
+def decode(bitstring: bitarray, key: str, key_length: int = 128) -> bitarray:
+    return _process(bitstring, AES(key, key_length).decrypt_into)
@@ -0,0 +1,132 @@
+import hmac
+import math
+import os
+from typing import Literal, Optional
+
+from src.tasks.task3.cipher import AES
+from src.tasks.task3.utils.ghash import build_multiplication_tables, ghash
+from src.utils.modes import StreamCipher, process_ctr
+
+StreamMode = Literal['CTR', 'GCM']
+
+STREAM_MODES = ('CTR', 'GCM')
+
+GCM_NONCE_SIZE = 12
+GCM_TAG_SIZE = 16
+
+_COUNTER_MASK = 0xFFFFFFFF
+
+
+def _process_gcm_counter(cipher: AES, text: bytes, initial_counter: int, start_block: int) -> bytes:
+    # GCM only increments the last 32 bits of the counter block.
+    prefix = (initial_counter >> 32) << 32
+    processed_text = bytearray()
+    for index, start in enumerate(range(0, len(text), 16), start=start_block):
+        chunk = text[start:(start + 16)]
+        counter = prefix | ((initial_counter + index) & _COUNTER_MASK)
+        keystream = cipher.encrypt_block(counter) >> (8 * (16 - len(chunk)))
+        processed_text += (int.from_bytes(chunk, byteorder='big') ^ keystream).to_bytes(len(chunk), byteorder='big')
+
+    return bytes(processed_text)
+
+
+def _check_nonce(mode: StreamMode, nonce: bytes) -> None:
+    if mode == 'CTR' and len(nonce) != 16:
+        raise ValueError('The nonce must be 16 bytes long.')
+
+    if mode == 'GCM' and not nonce:
+        raise ValueError('The nonce must not be empty.')
+
+
+def _check_authentication(
+    mode: StreamMode,
+    associated_data: Optional[bytes],
+    tag: Optional[bytes],
+    *,
+    is_decryption: bool,
+) -> None:
+    if mode == 'CTR' and (associated_data is not None or tag is not None):
+        raise ValueError('CTR mode does not use associated data or a tag.')
+
+    if mode == 'GCM' and is_decryption and len(tag or b'') not in range(4, GCM_TAG_SIZE + 1):
+        raise ValueError(f'The decryption needs a tag of 4 to {GCM_TAG_SIZE} bytes.')
+
+
+class AESCipher(StreamCipher):
+    def __init__(
+        self,
+        key: str,
+        mode: StreamMode = 'GCM',
+        nonce: Optional[bytes] = None,
+        *,
+        key_length: int = 128,
+        associated_data: Optional[bytes] = None,
+        tag: Optional[bytes] = None,
+        is_decryption: bool = False,
+    ):
+        if mode not in STREAM_MODES:
+            raise ValueError(f'Unknown mode: {mode}.')
+
+        _check_authentication(mode, associated_data, tag, is_decryption=is_decryption)
+        self.cipher = AES(key, key_length)
+        super().__init__(self.cipher.block_size)
+        self.mode = mode
+        self.is_decryption = is_decryption
+
+        if nonce is None:
+            nonce = os.urandom(GCM_NONCE_SIZE if mode == 'GCM' else self.block_size)
+
+        _check_nonce(mode, nonce)
+
+        self.nonce = nonce
+        self.tag = tag
+        self._counter = int.from_bytes(nonce, byteorder='big')
+        self._processed_blocks = 0
+
+        if mode == 'GCM':
+            self._init_gcm(associated_data or b'')
+
+    def _finalize(self, tail: bytes) -> bytes:
+        # The decrypted text is released by update before the tag is checked here,
+        # so it must not be trusted until finalize returns.
+        processed_text = self._process(tail)
+        if self.mode == 'GCM':
+            self._finalize_gcm()
+
+        return processed_text
+
+    def _init_gcm(self, associated_data: bytes) -> None:
+        self._tables = build_multiplication_tables(self.cipher.encrypt_block(0))
+
+        # A 96-bit nonce is used as is, any other one is hashed.
+        if len(self.nonce) == GCM_NONCE_SIZE:
+            self._initial_counter = (self._counter << 32) | 1
+        else:
+            lengths = (8 * len(self.nonce)).to_bytes(self.block_size, byteorder='big')
+            self._initial_counter = ghash(ghash(0, self.nonce, self._tables), lengths, self._tables)
+
+        self._associated_data_length = len(associated_data)
+        self._text_length = 0
+        self._hash = ghash(0, associated_data, self._tables)
+
+    def _finalize_gcm(self) -> None:
+        lengths = ((8 * self._associated_data_length) << 64) | (8 * self._text_length)
+        self._hash = ghash(self._hash, lengths.to_bytes(self.block_size, byteorder='big'), self._tables)
+        full_tag = (self.cipher.encrypt_block(self._initial_counter) ^ self._hash).to_bytes(GCM_TAG_SIZE, 'big')
+
+        if not self.is_decryption:
+            self.tag = full_tag
+        elif not hmac.compare_digest(full_tag[:len(self.tag)], self.tag):
+            raise ValueError('The tag does not match the text.')
+
+    def _process(self, text: bytes) -> bytes:
+        if self.mode == 'CTR':
+            processed_text = process_ctr(self.cipher, text, self._counter, self._processed_blocks)
+            self._processed_blocks += math.ceil(len(text) / self.block_size)
+            return processed_text
+
+        processed_text = _process_gcm_counter(self.cipher, text, self._initial_counter, self._processed_blocks + 1)
+        self._processed_blocks += math.ceil(len(text) / self.block_size)
+        self._text_length += len(text)
+        self._hash = ghash(self._hash, text if self.is_decryption else processed_text, self._tables)
+        return processed_text
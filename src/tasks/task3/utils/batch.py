@@ -0,0 +1,106 @@
+from functools import lru_cache
+from typing import Sequence
+
+import numpy as np
+
+from src.tasks.task3.utils.key_utils import get_key_schedule
+from src.tasks.task3.utils.tables import INV_MIX_COLUMNS_TABLES, INV_SBOX_TABLE, MIX_COLUMNS_TABLES, SBOX_TABLE
+from src.utils.tables import get_table
+
+# Blocks are processed in batches to keep the intermediate arrays small (a few dozen bytes per block).
+BATCH_SIZE = 1 << 16
+
+# A state is a row of 16 bytes in the order of the block, so the byte at the r-th row and the c-th column
+# has the index 4 * c + r and the row operations are fixed permutations of the columns of the array.
+_SHIFT_ROWS = np.array([4 * ((column + row) % 4) + row for column in range(4) for row in range(4)])
+_INV_SHIFT_ROWS = np.array([4 * ((column - row) % 4) + row for column in range(4) for row in range(4)])
+_ROTATIONS = [np.array([4 * column + (row + k) % 4 for column in range(4) for row in range(4)]) for k in range(4)]
+
+
+@lru_cache(maxsize=None)
+def _get_array(name: str) -> np.ndarray:
+    return np.array(get_table(name), dtype=np.uint8)
+
+
+def _mix_columns(states: np.ndarray, multiplication_tables: np.ndarray) -> np.ndarray:
+    # The i-th byte of a mixed column is the XOR of multiplication_tables[k][byte (i + k) of the column].
+    mixed_states = multiplication_tables[0][states]
+    for k in range(1, 4):
+        mixed_states ^= multiplication_tables[k][states[:, _ROTATIONS[k]]]
+
+    return mixed_states
+
+
+def _to_round_keys(words: Sequence[int]) -> np.ndarray:
+    return np.array(words, dtype='>u4').view(np.uint8).reshape(-1, 16)
+
+
+def encrypt_states(states: np.ndarray, round_keys: np.ndarray) -> np.ndarray:
+    sbox, multiplication_tables = _get_array(SBOX_TABLE)[0], _get_array(MIX_COLUMNS_TABLES)
+
+    states = states ^ round_keys[0]
+    for round_key in round_keys[1:-1]:
+        states = _mix_columns(sbox[states][:, _SHIFT_ROWS], multiplication_tables)
+        states ^= round_key
+
+    return sbox[states][:, _SHIFT_ROWS] ^ round_keys[-1]
+
+
+def decrypt_states(states: np.ndarray, round_keys: np.ndarray) -> np.ndarray:
+    # The round keys are expected in the order of the equivalent inverse cipher, which has the same structure
+    # as the encryption.
+    inv_sbox, multiplication_tables = _get_array(INV_SBOX_TABLE)[0], _get_array(INV_MIX_COLUMNS_TABLES)
+
+    states = states ^ round_keys[0]
+    for round_key in round_keys[1:-1]:
+        states = _mix_columns(inv_sbox[states][:, _INV_SHIFT_ROWS], multiplication_tables)
+        states ^= round_key
+
+    return inv_sbox[states][:, _INV_SHIFT_ROWS] ^ round_keys[-1]
+
+
+def _process_blocks(blocks: np.ndarray, round_keys: np.ndarray, *, is_decryption: bool) -> np.ndarray:
+    blocks = np.asarray(blocks, dtype=np.uint8).reshape(-1, 16)
+    process_states = decrypt_states if is_decryption else encrypt_states
+
+    processed_blocks = [np.empty((0, 16), dtype=np.uint8)]
+    for start in range(0, len(blocks), BATCH_SIZE):
+        processed_blocks.append(process_states(blocks[start:(start + BATCH_SIZE)], round_keys))
+
+    return np.concatenate(processed_blocks)
+
+
+def encrypt_blocks(blocks: np.ndarray, key: str, key_length: int = 128) -> np.ndarray:
+    round_keys = _to_round_keys(get_key_schedule(key, key_length).encryption_keys)
+    return _process_blocks(blocks, round_keys, is_decryption=False)
+
+
+def decrypt_blocks(blocks: np.ndarray, key: str, key_length: int = 128) -> np.ndarray:
+    round_keys = _to_round_keys(get_key_schedule(key, key_length).decryption_keys)
+    return _process_blocks(blocks, round_keys, is_decryption=True)
+
+
+def generate_counters(nonce: int, start_block: int, blocks_number: int) -> np.ndarray:
+    # The counters are 128-bit numbers, so the carry from the lower half is added to the higher one.
+    first_counter = (nonce + start_block) % (1 << 128)
+    first_low, first_high = np.uint64(first_counter & 0xFFFFFFFFFFFFFFFF), np.uint64(first_counter >> 64)
+
+    low = np.arange(blocks_number, dtype=np.uint64) + first_low
+    high = (low < first_low).astype(np.uint64) + first_high
+    return np.stack([high, low], axis=1).astype('>u8').view(np.uint8)
+
+
+def generate_ctr_keystream(
+    key: str,
+    nonce: int,
+    start_block: int,
+    blocks_number: int,
+    key_length: int = 128,
+) -> np.ndarray:
+    return encrypt_blocks(generate_counters(nonce, start_block, blocks_number), key, key_length)
+
+
+def process_ctr(text: bytes, key: str, nonce: int, start_block: int = 0, key_length: int = 128) -> bytes:
+    blocks_number = -(-len(text) // 16)
+    keystream = generate_ctr_keystream(key, nonce, start_block, blocks_number, key_length).ravel()
+    return (np.frombuffer(text, dtype=np.uint8) ^ keystream[:len(text)]).tobytes()
@@ -1,7 +1,7 @@
 from typing import List
 
 from bitarray import bitarray
-from bitarray.util import int2ba
+from bitarray.util import int2ba, zeros
 
 
 def convert_text_to_bitarray(text: str) -> bitarray:
@@ -32,3 +32,7 @@ def split_by_block_length(bits: bitarray, block_length: int) -> List[bitarray]:
         blocks[-1] = last_block
 
     return blocks
+
+
+def pad_with_zeros(bits: bitarray, block_length: int) -> bitarray:
+    return bits + zeros(-len(bits) % block_length)
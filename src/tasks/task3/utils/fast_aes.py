@@ -0,0 +1,154 @@
+import struct
+from typing import Callable, Sequence, Tuple, Union
+
+from src.tasks.task3.utils.galois import power
+from src.tasks.task3.utils.tables import DECRYPTION_TABLES, ENCRYPTION_TABLES, INV_SBOX_TABLE, SBOX_TABLE
+from src.utils.tables import get_table
+
+Words = Tuple[int, int, int, int]
+ProcessWords = Callable[[int, int, int, int, Sequence[int]], Words]
+Buffer = Union[bytes, bytearray, memoryview]
+WritableBuffer = Union[bytearray, memoryview]
+
+BLOCK_SIZE = 16
+
+_BLOCK_WORDS = struct.Struct('>4I')
+
+
+def sub_word(word: int) -> int:
+    s = get_table(SBOX_TABLE)[0]
+    return (s[word >> 24] << 24) | (s[(word >> 16) & 0xFF] << 16) | (s[(word >> 8) & 0xFF] << 8) | s[word & 0xFF]
+
+
+def rot_word(word: int) -> int:
+    return ((word << 8) & 0xFFFFFFFF) | (word >> 24)
+
+
+def expand_key(key: int, key_length: int) -> Tuple[int, ...]:
+    # The schedule is a flat array of 4 * (rounds + 1) words, where rounds = key words + 6.
+    key_words_number = key_length // 32
+    words = [(key >> (32 * shift)) & 0xFFFFFFFF for shift in reversed(range(key_words_number))]
+
+    for index in range(key_words_number, 4 * (key_words_number + 7)):
+        word = words[-1]
+        if index % key_words_number == 0:
+            word = sub_word(rot_word(word)) ^ (power(2, index // key_words_number - 1) << 24)
+        elif key_words_number > 6 and index % key_words_number == 4:
+            word = sub_word(word)
+
+        words.append(words[-key_words_number] ^ word)
+
+    return tuple(words)
+
+
+def _inv_mix_column(word: int) -> int:
+    # The decryption tables apply InvSubBytes before InvMixColumns, so the bytes are substituted beforehand.
+    s = get_table(SBOX_TABLE)[0]
+    d0, d1, d2, d3 = get_table(DECRYPTION_TABLES)
+    return d0[s[word >> 24]] ^ d1[s[(word >> 16) & 0xFF]] ^ d2[s[(word >> 8) & 0xFF]] ^ d3[s[word & 0xFF]]
+
+
+def reverse_rounds(round_keys: Sequence[int]) -> Tuple[int, ...]:
+    return tuple(word for start in reversed(range(0, len(round_keys), 4)) for word in round_keys[start:(start + 4)])
+
+
+def build_decryption_keys(encryption_keys: Sequence[int]) -> Tuple[int, ...]:
+    # The equivalent inverse cipher (FIPS-197, 5.3.5) uses the round keys from the last round to the first one,
+    # with InvMixColumns applied to all of them except the first and the last.
+    decryption_keys = reverse_rounds(encryption_keys)
+    inner_keys = [_inv_mix_column(word) for word in decryption_keys[4:-4]]
+    return (*decryption_keys[:4], *inner_keys, *decryption_keys[-4:])
+
+
+def split_block(block: int) -> Words:
+    return block >> 96, (block >> 64) & 0xFFFFFFFF, (block >> 32) & 0xFFFFFFFF, block & 0xFFFFFFFF
+
+
+def join_words(s0: int, s1: int, s2: int, s3: int) -> int:
+    return (s0 << 96) | (s1 << 64) | (s2 << 32) | s3
+
+
+def encrypt_block(block: int, round_keys: Sequence[int]) -> int:
+    return join_words(*encrypt_words(*split_block(block), round_keys))
+
+
+def decrypt_block(block: int, round_keys: Sequence[int]) -> int:
+    return join_words(*decrypt_words(*split_block(block), round_keys))
+
+
+def encrypt_words(s0: int, s1: int, s2: int, s3: int, round_keys: Sequence[int]) -> Words:
+    # The block is given as its four columns (big-endian 32-bit words).
+    e0, e1, e2, e3 = get_table(ENCRYPTION_TABLES)
+    s0 ^= round_keys[0]
+    s1 ^= round_keys[1]
+    s2 ^= round_keys[2]
+    s3 ^= round_keys[3]
+
+    # SubBytes, ShiftRows and MixColumns of a column are four table lookups: the j-th row byte
+    # is taken from the column that ShiftRows moves j positions to the left.
+    for k in range(4, len(round_keys) - 4, 4):
+        t0 = e0[s0 >> 24] ^ e1[(s1 >> 16) & 0xFF] ^ e2[(s2 >> 8) & 0xFF] ^ e3[s3 & 0xFF] ^ round_keys[k]
+        t1 = e0[s1 >> 24] ^ e1[(s2 >> 16) & 0xFF] ^ e2[(s3 >> 8) & 0xFF] ^ e3[s0 & 0xFF] ^ round_keys[k + 1]
+        t2 = e0[s2 >> 24] ^ e1[(s3 >> 16) & 0xFF] ^ e2[(s0 >> 8) & 0xFF] ^ e3[s1 & 0xFF] ^ round_keys[k + 2]
+        t3 = e0[s3 >> 24] ^ e1[(s0 >> 16) & 0xFF] ^ e2[(s1 >> 8) & 0xFF] ^ e3[s2 & 0xFF] ^ round_keys[k + 3]
+        s0, s1, s2, s3 = t0, t1, t2, t3
+
+    s = get_table(SBOX_TABLE)[0]
+    t0 = (s[s0 >> 24] << 24) | (s[(s1 >> 16) & 0xFF] << 16) | (s[(s2 >> 8) & 0xFF] << 8) | s[s3 & 0xFF]
+    t1 = (s[s1 >> 24] << 24) | (s[(s2 >> 16) & 0xFF] << 16) | (s[(s3 >> 8) & 0xFF] << 8) | s[s0 & 0xFF]
+    t2 = (s[s2 >> 24] << 24) | (s[(s3 >> 16) & 0xFF] << 16) | (s[(s0 >> 8) & 0xFF] << 8) | s[s1 & 0xFF]
+    t3 = (s[s3 >> 24] << 24) | (s[(s0 >> 16) & 0xFF] << 16) | (s[(s1 >> 8) & 0xFF] << 8) | s[s2 & 0xFF]
+
+    n = len(round_keys) - 4
+    return t0 ^ round_keys[n], t1 ^ round_keys[n + 1], t2 ^ round_keys[n + 2], t3 ^ round_keys[n + 3]
+
+
+def _inv_sub_shift_rows(s0: int, s1: int, s2: int, s3: int) -> Tuple[int, int, int, int]:
+    # InvShiftRows moves the j-th row j positions to the right.
+    s = get_table(INV_SBOX_TABLE)[0]
+    t0 = (s[s0 >> 24] << 24) | (s[(s3 >> 16) & 0xFF] << 16) | (s[(s2 >> 8) & 0xFF] << 8) | s[s1 & 0xFF]
+    t1 = (s[s1 >> 24] << 24) | (s[(s0 >> 16) & 0xFF] << 16) | (s[(s3 >> 8) & 0xFF] << 8) | s[s2 & 0xFF]
+    t2 = (s[s2 >> 24] << 24) | (s[(s1 >> 16) & 0xFF] << 16) | (s[(s0 >> 8) & 0xFF] << 8) | s[s3 & 0xFF]
+    t3 = (s[s3 >> 24] << 24) | (s[(s2 >> 16) & 0xFF] << 16) | (s[(s1 >> 8) & 0xFF] << 8) | s[s0 & 0xFF]
+    return t0, t1, t2, t3
+
+
+def decrypt_words(s0: int, s1: int, s2: int, s3: int, round_keys: Sequence[int]) -> Words:
+    # The round keys are expected in the order of the decryption (see build_decryption_keys). In the equivalent
+    # inverse cipher InvSubBytes, InvShiftRows and InvMixColumns of a column are four lookups like in the encryption.
+    d0, d1, d2, d3 = get_table(DECRYPTION_TABLES)
+    s0 ^= round_keys[0]
+    s1 ^= round_keys[1]
+    s2 ^= round_keys[2]
+    s3 ^= round_keys[3]
+
+    for k in range(4, len(round_keys) - 4, 4):
+        t0 = d0[s0 >> 24] ^ d1[(s3 >> 16) & 0xFF] ^ d2[(s2 >> 8) & 0xFF] ^ d3[s1 & 0xFF]
+        t1 = d0[s1 >> 24] ^ d1[(s0 >> 16) & 0xFF] ^ d2[(s3 >> 8) & 0xFF] ^ d3[s2 & 0xFF]
+        t2 = d0[s2 >> 24] ^ d1[(s1 >> 16) & 0xFF] ^ d2[(s0 >> 8) & 0xFF] ^ d3[s3 & 0xFF]
+        t3 = d0[s3 >> 24] ^ d1[(s2 >> 16) & 0xFF] ^ d2[(s1 >> 8) & 0xFF] ^ d3[s0 & 0xFF]
+        s0, s1, s2, s3 = t0 ^ round_keys[k], t1 ^ round_keys[k + 1], t2 ^ round_keys[k + 2], t3 ^ round_keys[k + 3]
+
+    s0, s1, s2, s3 = _inv_sub_shift_rows(s0, s1, s2, s3)
+    n = len(round_keys) - 4
+    return s0 ^ round_keys[n], s1 ^ round_keys[n + 1], s2 ^ round_keys[n + 2], s3 ^ round_keys[n + 3]
+
+
+def process_buffer(
+    text: Buffer,
+    output: WritableBuffer,
+    process_words: ProcessWords,
+    round_keys: Sequence[int],
+) -> None:
+    # The blocks are read from and written to the buffers directly, so the output may be the text itself.
+    text = memoryview(text).cast('B')
+    output = memoryview(output).cast('B')
+    if len(text) % BLOCK_SIZE != 0:
+        raise ValueError('The length of the text must be a multiple of the block size.')
+
+    if len(output) < len(text):
+        raise ValueError('The output buffer must be at least as long as the text.')
+
+    for offset in range(0, len(text), BLOCK_SIZE):
+        words = process_words(*_BLOCK_WORDS.unpack_from(text, offset), round_keys)
+        _BLOCK_WORDS.pack_into(output, offset, *words)
@@ -0,0 +1,66 @@
+from typing import Tuple
+
+# The AES field GF(2^8) is built with the polynomial x^8 + x^4 + x^3 + x + 1.
+_MODULUS = 0x11B
+
+
+def multiply(first: int, second: int) -> int:
+    product = 0
+    while second:
+        if second & 1:
+            product ^= first
+
+        first <<= 1
+        if first & 0x100:
+            first ^= _MODULUS
+
+        second >>= 1
+
+    return product
+
+
+def power(base: int, exponent: int) -> int:
+    product = 1
+    for _ in range(exponent):
+        product = multiply(product, base)
+
+    return product
+
+
+def build_multiplication_table(factor: int) -> Tuple[int, ...]:
+    return tuple(multiply(factor, byte) for byte in range(256))
+
+
+def build_inverses() -> Tuple[int, ...]:
+    # 3 generates the multiplicative group, so the inverse of 3^i is 3^(255 - i). Zero is mapped to itself.
+    powers = [1]
+    for _ in range(254):
+        powers.append(multiply(powers[-1], 3))
+
+    inverses = [0] * 256
+    for exponent, element in enumerate(powers):
+        inverses[element] = powers[-exponent % 255]
+
+    return tuple(inverses)
+
+
+def _rotate_left(byte: int, shift: int) -> int:
+    return ((byte << shift) | (byte >> (8 - shift))) & 0xFF
+
+
+def build_sbox() -> Tuple[int, ...]:
+    # The S-box is the inversion in the field followed by the affine transformation.
+    sbox = []
+    for inverse in build_inverses():
+        rotations = [_rotate_left(inverse, shift) for shift in range(1, 5)]
+        sbox.append(inverse ^ rotations[0] ^ rotations[1] ^ rotations[2] ^ rotations[3] ^ 0x63)
+
+    return tuple(sbox)
+
+
+def build_inv_sbox() -> Tuple[int, ...]:
+    inv_sbox = [0] * 256
+    for byte, substituted_byte in enumerate(build_sbox()):
+        inv_sbox[substituted_byte] = byte
+
+    return tuple(inv_sbox)
@@ -0,0 +1,52 @@
+from typing import Tuple
+
+BLOCK_SIZE = 16
+
+MultiplicationTables = Tuple[Tuple[int, ...], ...]
+
+# The reduction polynomial x^128 + x^7 + x^2 + x + 1 in the reflected bit order of GCM.
+_REDUCTION = 0xE1 << 120
+
+
+def _multiply_by_x(element: int) -> int:
+    return (element >> 1) ^ _REDUCTION if element & 1 else element >> 1
+
+
+def build_multiplication_tables(hash_key: int) -> MultiplicationTables:
+    # tables[i][byte] is the product of the hash key and the element that has only the i-th byte (counting from
+    # the most significant one) set to byte, so a multiplication becomes 16 lookups and XORs.
+    # The most significant bit of an element is the coefficient of x^0.
+    powers = [hash_key]
+    for _ in range(127):
+        powers.append(_multiply_by_x(powers[-1]))
+
+    tables = []
+    for index in range(BLOCK_SIZE):
+        table = [0] * 256
+        for shift in range(8):
+            table[0x80 >> shift] = powers[8 * index + shift]
+
+        for byte in range(1, 256):
+            higher_bits = byte & (byte - 1)
+            table[byte] = table[byte ^ higher_bits] ^ table[higher_bits]
+
+        tables.append(tuple(table))
+
+    return tuple(tables)
+
+
+def multiply(element: int, tables: MultiplicationTables) -> int:
+    product = 0
+    for index, table in enumerate(tables):
+        product ^= table[(element >> (120 - 8 * index)) & 0xFF]
+
+    return product
+
+
+def ghash(state: int, text: bytes, tables: MultiplicationTables) -> int:
+    # The incomplete last block is padded with zeros.
+    for start in range(0, len(text), BLOCK_SIZE):
+        block = text[start:(start + BLOCK_SIZE)].ljust(BLOCK_SIZE, b'\0')
+        state = multiply(state ^ int.from_bytes(block, byteorder='big'), tables)
+
+    return state
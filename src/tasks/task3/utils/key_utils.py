@@ -0,0 +1,41 @@
+from functools import lru_cache
+from typing import NamedTuple, Tuple
+
+from bitarray.util import ba2int
+
+from src.tasks.task3.utils.bitarray_utils import convert_hex_key_to_bitarray
+from src.tasks.task3.utils.fast_aes import build_decryption_keys, expand_key
+
+KEY_LENGTHS = (128, 192, 256)
+KEY_SCHEDULE_CACHE_SIZE = 256
+
+
+class KeySchedule(NamedTuple):
+    encryption_keys: Tuple[int, ...]
+    decryption_keys: Tuple[int, ...]
+
+
+def normalize_key(key: str, key_length: int) -> int:
+    if key_length not in KEY_LENGTHS:
+        raise ValueError('The key length must be 128, 192 or 256 bits.')
+
+    return ba2int(convert_hex_key_to_bitarray(key, length=key_length))
+
+
+@lru_cache(maxsize=KEY_SCHEDULE_CACHE_SIZE)
+def _expand_key(normalized_key: int, key_length: int) -> KeySchedule:
+    encryption_keys = expand_key(normalized_key, key_length)
+    return KeySchedule(encryption_keys, build_decryption_keys(encryption_keys))
+
+
+def get_key_schedule(key: str, key_length: int = 128) -> KeySchedule:
+    # Keys that differ only in the representation (e.g. leading zeros) share the cached schedule.
+    return _expand_key(normalize_key(key, key_length), key_length)
+
+
+def get_key_schedule_cache_info():
+    return _expand_key.cache_info()
+
+
+def clear_key_schedule_cache() -> None:
+    _expand_key.cache_clear()
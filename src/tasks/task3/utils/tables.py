@@ -0,0 +1,59 @@
+from typing import Sequence, Tuple
+
+from src.tasks.task3.utils.galois import build_inv_sbox, build_multiplication_table, build_sbox
+from src.utils.tables import Table, get_table, register_table
+
+SBOX_TABLE = 'aes-sbox'
+INV_SBOX_TABLE = 'aes-inv-sbox'
+MIX_COLUMNS_TABLES = 'aes-mix-columns'
+INV_MIX_COLUMNS_TABLES = 'aes-inv-mix-columns'
+ENCRYPTION_TABLES = 'aes-encryption'
+DECRYPTION_TABLES = 'aes-decryption'
+
+# The mix columns matrices are circulant: the i-th byte of a mixed column is the sum of row[k] * byte (i + k).
+MIX_COLUMNS_ROW = (2, 3, 1, 1)
+INV_MIX_COLUMNS_ROW = (14, 11, 13, 9)
+
+
+def build_word_tables(sbox: Sequence[int], multiplication_tables: Table) -> Tuple[Tuple[int, ...], ...]:
+    # tables[j][byte] is the column that MixColumns makes of the substituted byte standing in the j-th row,
+    # so a whole round of a column is four lookups and XORs.
+    tables = []
+    for j in range(4):
+        column_tables = [multiplication_tables[(j - i) % 4] for i in range(4)]
+        tables.append(tuple(
+            int.from_bytes(bytes(table[sbox[byte]] for table in column_tables), byteorder='big')
+            for byte in range(256)
+        ))
+
+    return tuple(tables)
+
+
+@register_table(SBOX_TABLE, 'B')
+def _build_sbox_table() -> Table:
+    return (build_sbox(),)
+
+
+@register_table(INV_SBOX_TABLE, 'B')
+def _build_inv_sbox_table() -> Table:
+    return (build_inv_sbox(),)
+
+
+@register_table(MIX_COLUMNS_TABLES, 'B')
+def _build_mix_columns_tables() -> Table:
+    return tuple(build_multiplication_table(factor) for factor in MIX_COLUMNS_ROW)
+
+
+@register_table(INV_MIX_COLUMNS_TABLES, 'B')
+def _build_inv_mix_columns_tables() -> Table:
+    return tuple(build_multiplication_table(factor) for factor in INV_MIX_COLUMNS_ROW)
+
+
+@register_table(ENCRYPTION_TABLES, 'I')
+def _build_encryption_tables() -> Table:
+    return build_word_tables(get_table(SBOX_TABLE)[0], get_table(MIX_COLUMNS_TABLES))
+
+
+@register_table(DECRYPTION_TABLES, 'I')
+def _build_decryption_tables() -> Table:
+    return build_word_tables(get_table(INV_SBOX_TABLE)[0], get_table(INV_MIX_COLUMNS_TABLES))
@@ -0,0 +1,62 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Union
+
+import numpy as np
+
+from src.tasks.task5.md5 import BLOCK_SIZE, INITIAL_STATE, ROTATIONS, ROUNDS, get_padding
+
+# Messages are hashed in batches to keep the lanes small (64 bytes of words per message and block).
+BATCH_SIZE = 1 << 16
+
+_FUNCTIONS = (
+    lambda x, y, z: z ^ (x & (y ^ z)),
+    lambda x, y, z: y ^ (z & (x ^ y)),
+    lambda x, y, z: x ^ y ^ z,
+    lambda x, y, z: y ^ (x | np.invert(z)),
+)
+
+
+def compress_lanes(state: np.ndarray, words: np.ndarray) -> np.ndarray:
+    # state has one column per message (4 x N) and words[i] is the i-th message word of every lane (16 x N).
+    # The additions of uint32 arrays wrap around, so no masking is needed.
+    a, b, c, d = state
+    for function, groups, rotations in zip(_FUNCTIONS, ROUNDS, ROTATIONS):
+        for group in groups:
+            for index, rotation, constant in zip(group[:4], rotations, group[4:]):
+                f = a + function(b, c, d) + words[index] + np.uint32(constant)
+                a, d, c, b = d, c, b, b + ((f << rotation) | (f >> (32 - rotation)))
+
+    return state + np.stack([a, b, c, d])
+
+
+def _hash_padded_messages(messages: List[bytes], blocks_number: int) -> np.ndarray:
+    # The padded messages all have the same number of blocks, so their words form a dense (N, blocks, 16) array.
+    words = np.frombuffer(b''.join(messages), dtype='<u4').reshape(len(messages), blocks_number, 16)
+    state = np.repeat(np.array(INITIAL_STATE, dtype=np.uint32)[:, None], len(messages), axis=1)
+    for block_index in range(blocks_number):
+        state = compress_lanes(state, np.ascontiguousarray(words[:, block_index].T))
+
+    return np.ascontiguousarray(state.T).astype('<u4')
+
+
+def hash_many(messages: Iterable[Union[str, bytes]]) -> List[bytes]:
+    # Every message gets its own lane; messages with the same padded length are hashed together.
+    groups: Dict[int, List[int]] = defaultdict(list)
+    padded_messages = []
+    for position, message in enumerate(messages):
+        if isinstance(message, str):
+            message = message.encode('utf-8')
+
+        padded_message = bytes(message) + get_padding(len(message))
+        groups[len(padded_message) // BLOCK_SIZE].append(position)
+        padded_messages.append(padded_message)
+
+    digests: List[bytes] = [b''] * len(padded_messages)
+    for blocks_number, positions in groups.items():
+        for start in range(0, len(positions), BATCH_SIZE):
+            batch = positions[start:(start + BATCH_SIZE)]
+            states = _hash_padded_messages([padded_messages[index] for index in batch], blocks_number)
+            for index, state in zip(batch, states):
+                digests[index] = state.tobytes()
+
+    return digests
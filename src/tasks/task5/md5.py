@@ -1,125 +1,218 @@
 import struct
-from typing import List
+from functools import partial
+from typing import Callable, Optional, Tuple
+
+_MASK = 0xFFFFFFFF
+
+BLOCK_SIZE = 64
+DIGEST_SIZE = 16
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+State = Tuple[int, int, int, int]
+
+INITIAL_STATE = (0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476)
+_LENGTH_MASK = 2 ** 64 - 1
+
+_WORDS = struct.Struct('<16I')
+
+# A midstate is the format version, the four state words and the processed length in bytes,
+# followed by the buffered tail (the last length % 64 bytes).
+_MIDSTATE = struct.Struct('<B4IQ')
+_MIDSTATE_VERSION = 1
+
+# The rotations of the four steps of a group in every round.
+ROTATIONS = ((7, 12, 17, 22), (5, 9, 14, 20), (4, 11, 16, 23), (6, 10, 15, 21))
+
+_CONSTANTS = (
+    0xD76AA478, 0xE8C7B756, 0x242070DB, 0xC1BDCEEE,
+    0xF57C0FAF, 0x4787C62A, 0xA8304613, 0xFD469501,
+    0x698098D8, 0x8B44F7AF, 0xFFFF5BB1, 0x895CD7BE,
+    0x6B901122, 0xFD987193, 0xA679438E, 0x49B40821,
+    0xF61E2562, 0xC040B340, 0x265E5A51, 0xE9B6C7AA,
+    0xD62F105D, 0x02441453, 0xD8A1E681, 0xE7D3FBC8,
+    0x21E1CDE6, 0xC33707D6, 0xF4D50D87, 0x455A14ED,
+    0xA9E3E905, 0xFCEFA3F8, 0x676F02D9, 0x8D2A4C8A,
+    0xFFFA3942, 0x8771F681, 0x6D9D6122, 0xFDE5380C,
+    0xA4BEEA44, 0x4BDECFA9, 0xF6BB4B60, 0xBEBFBC70,
+    0x289B7EC6, 0xEAA127FA, 0xD4EF3085, 0x04881D05,
+    0xD9D4D039, 0xE6DB99E5, 0x1FA27CF8, 0xC4AC5665,
+    0xF4292244, 0x432AFF97, 0xAB9423A7, 0xFC93A039,
+    0x655B59C3, 0x8F0CCC92, 0xFFEFF47D, 0x85845DD1,
+    0x6FA87E4F, 0xFE2CE6E0, 0xA3014314, 0x4E0811A1,
+    0xF7537E82, 0xBD3AF235, 0x2AD7D2BB, 0xEB86D391,
+)
+
+
+def _build_rounds() -> Tuple[Tuple[Tuple[int, ...], ...], ...]:
+    # The 16 steps of a round are grouped by four: every group updates a, d, c, b in turn with the same four
+    # rotations, so rounds[r][g] is the message word indices and the additive constants of the g-th group.
+    word_indices = (
+        lambda i: i,
+        lambda i: (5 * i + 1) % 16,
+        lambda i: (3 * i + 5) % 16,
+        lambda i: (7 * i) % 16,
+    )
+    return tuple(
+        tuple(
+            (*[word_index(i) for i in range(start, start + 4)], *_CONSTANTS[start:(start + 4)])
+            for start in range(16 * index, 16 * (index + 1), 4)
+        )
+        for index, word_index in enumerate(word_indices)
+    )
 
-from bitarray import bitarray
 
-_MODULUS = 2 ** 32
+ROUNDS = _build_rounds()
+
+
+def _compress(state: State, block: bytes) -> State:
+    # Every round has its own loop, so the boolean function and the rotations are fixed and a step is
+    # a couple of additions and a rotation kept below 2^32 with one mask each.
+    a, b, c, d = state
+    x = _WORDS.unpack(block)
+    mask = _MASK
+    first_round, second_round, third_round, fourth_round = ROUNDS
+
+    for i0, i1, i2, i3, t0, t1, t2, t3 in first_round:
+        f = (a + (d ^ (b & (c ^ d))) + x[i0] + t0) & mask
+        a = (b + ((f << 7) | (f >> 25))) & mask
+        f = (d + (c ^ (a & (b ^ c))) + x[i1] + t1) & mask
+        d = (a + ((f << 12) | (f >> 20))) & mask
+        f = (c + (b ^ (d & (a ^ b))) + x[i2] + t2) & mask
+        c = (d + ((f << 17) | (f >> 15))) & mask
+        f = (b + (a ^ (c & (d ^ a))) + x[i3] + t3) & mask
+        b = (c + ((f << 22) | (f >> 10))) & mask
+
+    for i0, i1, i2, i3, t0, t1, t2, t3 in second_round:  # noqa: WPS440
+        f = (a + (c ^ (d & (b ^ c))) + x[i0] + t0) & mask
+        a = (b + ((f << 5) | (f >> 27))) & mask
+        f = (d + (b ^ (c & (a ^ b))) + x[i1] + t1) & mask
+        d = (a + ((f << 9) | (f >> 23))) & mask
+        f = (c + (a ^ (b & (d ^ a))) + x[i2] + t2) & mask
+        c = (d + ((f << 14) | (f >> 18))) & mask
+        f = (b + (d ^ (a & (c ^ d))) + x[i3] + t3) & mask
+        b = (c + ((f << 20) | (f >> 12))) & mask
+
+    for i0, i1, i2, i3, t0, t1, t2, t3 in third_round:  # noqa: WPS440
+        f = (a + (b ^ c ^ d) + x[i0] + t0) & mask
+        a = (b + ((f << 4) | (f >> 28))) & mask
+        f = (d + (a ^ b ^ c) + x[i1] + t1) & mask
+        d = (a + ((f << 11) | (f >> 21))) & mask
+        f = (c + (d ^ a ^ b) + x[i2] + t2) & mask
+        c = (d + ((f << 16) | (f >> 16))) & mask
+        f = (b + (c ^ d ^ a) + x[i3] + t3) & mask
+        b = (c + ((f << 23) | (f >> 9))) & mask
+
+    for i0, i1, i2, i3, t0, t1, t2, t3 in fourth_round:  # noqa: WPS440
+        f = (a + (c ^ (b | (d ^ mask))) + x[i0] + t0) & mask
+        a = (b + ((f << 6) | (f >> 26))) & mask
+        f = (d + (b ^ (a | (c ^ mask))) + x[i1] + t1) & mask
+        d = (a + ((f << 10) | (f >> 22))) & mask
+        f = (c + (a ^ (d | (b ^ mask))) + x[i2] + t2) & mask
+        c = (d + ((f << 15) | (f >> 17))) & mask
+        f = (b + (d ^ (c | (a ^ mask))) + x[i3] + t3) & mask
+        b = (c + ((f << 21) | (f >> 11))) & mask
+
+    a0, b0, c0, d0 = state
+    return (a0 + a) & mask, (b0 + b) & mask, (c0 + c) & mask, (d0 + d) & mask
+
+
+def get_padding(length: int) -> bytes:
+    # The padding of a message of the given length in bytes: a one bit, zeros and the length in bits.
+    zeros_length = (BLOCK_SIZE - 8 - (length + 1) % BLOCK_SIZE) % BLOCK_SIZE
+    return b''.join([b'\x80', bytes(zeros_length), struct.pack('<Q', (8 * length) & _LENGTH_MASK)])
+
+
+def _parse_midstate(midstate: bytes) -> Tuple[State, int, bytes]:
+    if len(midstate) < _MIDSTATE.size:
+        raise ValueError('The midstate is too short.')
+
+    fields = _MIDSTATE.unpack_from(midstate)
+    version, state, length = fields[0], fields[1:5], fields[5]
+    if version != _MIDSTATE_VERSION:
+        raise ValueError(f'Unsupported midstate version: {version}.')
+
+    tail = bytes(midstate[_MIDSTATE.size:])
+    if len(tail) != length % BLOCK_SIZE:
+        raise ValueError('The buffered tail of the midstate does not match its length.')
+
+    return state, length, tail
 
 
 class MD5:
-    _s = (
-        7, 12, 17, 22, 7, 12, 17, 22, 7, 12, 17, 22, 7, 12, 17, 22,
-        5, 9, 14, 20, 5, 9, 14, 20, 5, 9, 14, 20, 5, 9, 14, 20,
-        4, 11, 16, 23, 4, 11, 16, 23, 4, 11, 16, 23, 4, 11, 16, 23,
-        6, 10, 15, 21, 6, 10, 15, 21, 6, 10, 15, 21, 6, 10, 15, 21,
-    )
-
-    _t = (
-        0xD76AA478, 0xE8C7B756, 0x242070DB, 0xC1BDCEEE,
-        0xF57C0FAF, 0x4787C62A, 0xA8304613, 0xFD469501,
-        0x698098D8, 0x8B44F7AF, 0xFFFF5BB1, 0x895CD7BE,
-        0x6B901122, 0xFD987193, 0xA679438E, 0x49B40821,
-        0xF61E2562, 0xC040B340, 0x265E5A51, 0xE9B6C7AA,
-        0xD62F105D, 0x02441453, 0xD8A1E681, 0xE7D3FBC8,
-        0x21E1CDE6, 0xC33707D6, 0xF4D50D87, 0x455A14ED,
-        0xA9E3E905, 0xFCEFA3F8, 0x676F02D9, 0x8D2A4C8A,
-        0xFFFA3942, 0x8771F681, 0x6D9D6122, 0xFDE5380C,
-        0xA4BEEA44, 0x4BDECFA9, 0xF6BB4B60, 0xBEBFBC70,
-        0x289B7EC6, 0xEAA127FA, 0xD4EF3085, 0x04881D05,
-        0xD9D4D039, 0xE6DB99E5, 0x1FA27CF8, 0xC4AC5665,
-        0xF4292244, 0x432AFF97, 0xAB9423A7, 0xFC93A039,
-        0x655B59C3, 0x8F0CCC92, 0xFFEFF47D, 0x85845DD1,
-        0x6FA87E4F, 0xFE2CE6E0, 0xA3014314, 0x4E0811A1,
-        0xF7537E82, 0xBD3AF235, 0x2AD7D2BB, 0xEB86D391,
-    )
+    name = 'md5'
+    block_size = BLOCK_SIZE
+    digest_size = DIGEST_SIZE
+
+    def __init__(self, message: bytes = b'', *, midstate: Optional[bytes] = None):
+        # A midstate (see export_midstate) resumes the hashing where it was exported.
+        state, length, tail = _parse_midstate(midstate) if midstate is not None else (INITIAL_STATE, 0, b'')
+        self._state: State = state
+        self._length = length
+        self._buffer = tail
+        self.update(message)
 
     @classmethod
-    def hash(cls, text: str) -> int:  # noqa: WPS231
-        bit_text = cls.__text_to_bits(text)
-        cls.__expand_bits(bit_text)
-
-        a0 = 0x67452301
-        b0 = 0xEFCDAB89
-        c0 = 0x98BADCFE
-        d0 = 0x10325476
-
-        for block in cls.__split_by_chunk_length(bit_text, 512):
-            a = a0
-            b = b0
-            c = c0
-            d = d0
-
-            words = cls.__split_by_chunk_length(block, 32)
-            words = [int.from_bytes(word.tobytes(), byteorder='little') for word in words]
-
-            for i in range(64):
-                if i in range(16):
-                    f = (b & c) | (~b & d)  # noqa: WPS465
-                    k = i
-                elif i in range(16, 32):
-                    f = (b & d) | (~d & c)  # noqa: WPS465
-                    k = (5 * i + 1) % 16
-                elif i in range(32, 48):
-                    f = b ^ c ^ d
-                    k = (3 * i + 5) % 16
-                else:
-                    f = c ^ (~d | b)  # noqa: WPS465
-                    k = (7 * i) % 16
-
-                f = (f + a) % _MODULUS
-                f = (f + words[k]) % _MODULUS
-                f = (f + cls._t[i]) % _MODULUS
-                f = cls.__rotate_left(f, cls._s[i])
-                f = (f + b) % _MODULUS
-
-                a = d
-                d = c
-                c = b
-                b = f
-
-            a0 = (a0 + a) % _MODULUS
-            b0 = (b0 + b) % _MODULUS
-            c0 = (c0 + c) % _MODULUS
-            d0 = (d0 + d) % _MODULUS
-
-        return cls.__convert_states(a0, b0, c0, d0)
-
-    @staticmethod
-    def __text_to_bits(text: str) -> bitarray:
-        array = bitarray()
-        array.frombytes(text.encode('utf-8'))
-        return array
-
-    @staticmethod
-    def __expand_bits(bits: bitarray) -> None:
-        bits_length = len(bits)
-        length_bits = bitarray()
-        length_bits.frombytes(struct.pack('<Q', bits_length))
-
-        bits.append(1)
-
-        if len(bits) % 512 <= 448:
-            need_to_fill = 448 - len(bits) % 512
-        else:
-            need_to_fill = 960 - len(bits) % 512  # 960 = 512 + 448
-
-        bits.extend([0] * need_to_fill)
-
-        bits += length_bits
-
-    @staticmethod
-    def __split_by_chunk_length(bits: bitarray, block_length: int) -> List[bitarray]:
-        return [bits[i: (i + block_length)] for i in range(0, len(bits), block_length)]
-
-    @staticmethod
-    def __rotate_left(x: int, n: int) -> int:
-        return (x << n) | (x >> (32 - n))
-
-    @staticmethod
-    def __convert_states(a: int, b: int, c: int, d: int) -> int:
-        a = int.from_bytes(struct.pack('>I', a), byteorder='little')
-        b = int.from_bytes(struct.pack('>I', b), byteorder='little')
-        c = int.from_bytes(struct.pack('>I', c), byteorder='little')
-        d = int.from_bytes(struct.pack('>I', d), byteorder='little')
-
-        return int(f'{format(a, "08x")}{format(b, "08x")}{format(c, "08x")}{format(d, "08x")}', 16)
+    def hash(cls, text: str) -> int:
+        return int.from_bytes(cls(text.encode('utf-8')).digest(), byteorder='big')
+
+    def update(self, message: bytes) -> None:
+        # Only the incomplete last block is buffered, the whole blocks are compressed straight from the data.
+        view = memoryview(message).cast('B')
+        self._length += len(view)
+
+        start = 0
+        if self._buffer:
+            start = min(BLOCK_SIZE - len(self._buffer), len(view))
+            self._buffer += view[:start]
+            if len(self._buffer) < BLOCK_SIZE:
+                return
+
+            self._state = _compress(self._state, self._buffer)
+            self._buffer = b''
+
+        stop = start + (len(view) - start) // BLOCK_SIZE * BLOCK_SIZE
+        for offset in range(start, stop, BLOCK_SIZE):
+            self._state = _compress(self._state, view[offset:(offset + BLOCK_SIZE)])
+
+        self._buffer = bytes(view[stop:])
+
+    def copy(self) -> 'MD5':
+        return type(self)(midstate=self.export_midstate())
+
+    def export_midstate(self) -> bytes:
+        return _MIDSTATE.pack(_MIDSTATE_VERSION, *self._state, self._length) + self._buffer
+
+    def digest(self) -> bytes:
+        # The padding is compressed into a copy of the state, so the hash can still be updated afterwards.
+        tail = self._buffer + get_padding(self._length)
+
+        state = self._state
+        for offset in range(0, len(tail), BLOCK_SIZE):
+            state = _compress(state, tail[offset:(offset + BLOCK_SIZE)])
+
+        return struct.pack('<4I', *state)
+
+    def hexdigest(self) -> str:
+        return self.digest().hex()
+
+
+def hash_file(
+    path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    *,
+    midstate: Optional[bytes] = None,
+    checkpoint: Optional[Callable[[bytes], None]] = None,
+) -> MD5:
+    # The file is read in chunks, so the memory does not depend on its size. With a midstate exported while
+    # hashing the same file, the hashing resumes after the processed bytes; checkpoint gets the midstate
+    # after every chunk.
+    md5 = MD5(midstate=midstate)
+    start = _parse_midstate(midstate)[1] if midstate is not None else 0
+    with open(path, 'rb') as input_file:
+        input_file.seek(start)
+        for chunk in iter(partial(input_file.read, chunk_size), b''):
+            md5.update(chunk)
+            if checkpoint is not None:
+                checkpoint(md5.export_midstate())
+
+    return md5
@@ -0,0 +1,190 @@
+import json
+import os
+import stat
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextlib import ExitStack
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+sys.path.append('')
+sys.path.append('../../..')
+
+from src.tasks.task5.md5 import hash_file
+
+DEFAULT_CACHE_NAME = '.md5-cache.json'
+
+# A cache entry is [size, mtime in nanoseconds, inode, hex digest]; a file is rehashed when any of them changes.
+CacheEntry = List
+Cache = Dict[str, CacheEntry]
+
+
+class TreeReport(NamedTuple):
+    digests: Dict[str, str]
+    errors: Dict[str, str]
+    hashed_files: int
+    cached_files: int
+    hashed_bytes: int
+    seconds: float
+
+    @property
+    def files_per_second(self) -> float:
+        return (self.hashed_files + self.cached_files) / self.seconds if self.seconds else 0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.hashed_bytes / (1 << 20) / self.seconds if self.seconds else 0
+
+
+def load_cache(path: str) -> Cache:
+    if not os.path.exists(path):
+        return {}
+
+    with open(path) as cache_file:
+        return json.load(cache_file)
+
+
+def save_cache(path: str, cache: Cache) -> None:
+    # The cache is written under a temporary name and then renamed, so an interrupted run never corrupts it.
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temporary_path = tempfile.mkstemp(dir=directory)
+    with os.fdopen(descriptor, 'w') as cache_file:
+        json.dump(cache, cache_file)
+
+    os.replace(temporary_path, path)
+
+
+def iter_files(root: str) -> Iterator[str]:
+    for directory, directory_names, file_names in os.walk(root):
+        directory_names.sort()
+        yield from (os.path.join(directory, file_name) for file_name in sorted(file_names))
+
+
+def _hash_file(path: str) -> str:
+    return hash_file(path).hexdigest()
+
+
+class _TreeHasher:
+    def __init__(self, cache: Cache, queue_size: int):
+        self.cache = cache
+        self._queue_size = queue_size
+        self.digests: Dict[str, str] = {}
+        self.errors: Dict[str, str] = {}
+        self.hashed_files = 0
+        self.cached_files = 0
+        self.hashed_bytes = 0
+        self._pending: Dict[Future, Tuple[str, CacheEntry]] = {}
+
+    def run(self, executor: ProcessPoolExecutor, paths: Iterator[str]) -> None:
+        for path in paths:
+            key = self._get_key(path)
+            if key is None or self._use_cache(path, key):
+                continue
+
+            # At most queue_size files are waiting in the pool, so the walk never runs far ahead of the workers.
+            if len(self._pending) >= self._queue_size:
+                self._collect(wait(self._pending, return_when=FIRST_COMPLETED).done)
+
+            self._pending[executor.submit(_hash_file, path)] = (path, key)
+
+        self._collect(wait(self._pending).done)
+
+    def _get_key(self, path: str) -> Optional[CacheEntry]:
+        try:
+            status = os.stat(path)
+        except OSError as error:
+            # E.g. a broken symbolic link or a file removed during the walk.
+            self.errors[path] = str(error)
+            return None
+
+        # Pipes and devices could block a worker forever, so only regular files are hashed.
+        if not stat.S_ISREG(status.st_mode):
+            return None
+
+        return [status.st_size, status.st_mtime_ns, status.st_ino]
+
+    def _use_cache(self, path: str, key: CacheEntry) -> bool:
+        entry = self.cache.get(path)
+        if entry is None or entry[:3] != key:
+            return False
+
+        self.digests[path] = entry[3]
+        self.cached_files += 1
+        return True
+
+    def _collect(self, futures) -> None:
+        for future in futures:
+            path, key = self._pending.pop(future)
+            try:
+                self.digests[path] = future.result()
+            except OSError as error:
+                self.errors[path] = str(error)
+                continue
+
+            self.cache[path] = [*key, self.digests[path]]
+            self.hashed_files += 1
+            self.hashed_bytes += key[0]
+
+
+def hash_tree(
+    root: str,
+    *,
+    cache_path: Optional[str] = None,
+    processes: Optional[int] = None,
+    queue_size: Optional[int] = None,
+) -> TreeReport:
+    start_time = time.perf_counter()
+    root = os.path.abspath(root)
+    processes = processes or os.cpu_count() or 1
+    cache = load_cache(cache_path) if cache_path else {}
+
+    # The cache itself may lie in the tree, but it changes on every run.
+    cache_file_path = os.path.abspath(cache_path) if cache_path else None
+    paths = (path for path in iter_files(root) if path != cache_file_path)
+
+    hasher = _TreeHasher(cache, queue_size or 4 * processes)
+    with ExitStack() as stack:
+        # The cache is saved even if the run fails, so the files hashed so far aren't hashed again.
+        if cache_path:
+            stack.callback(save_cache, cache_path, cache)
+
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            hasher.run(executor, paths)
+
+        # The entries of the files that are gone from the tree are dropped, the other trees are kept.
+        prefix = os.path.join(root, '')
+        stale_paths = [path for path in cache if path.startswith(prefix) and path not in hasher.digests]
+        for path in stale_paths:
+            cache.pop(path)
+
+    return TreeReport(
+        hasher.digests,
+        hasher.errors,
+        hasher.hashed_files,
+        hasher.cached_files,
+        hasher.hashed_bytes,
+        time.perf_counter() - start_time,
+    )
+
+
+def main() -> None:
+    root = sys.argv[1] if len(sys.argv) > 1 else '.'
+    cache_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_CACHE_NAME
+    report = hash_tree(root, cache_path=cache_path)
+
+    for path, digest in sorted(report.digests.items()):
+        print(f'{digest}  {os.path.relpath(path, root)}')
+
+    for error in report.errors.values():
+        print(error, file=sys.stderr)
+
+    speed = f'{report.files_per_second:.1f} files/s, {report.megabytes_per_second:.2f} MB/s'
+    print(f'{report.hashed_files} hashed and {report.cached_files} cached files: {speed}', file=sys.stderr)
+
+    if report.errors:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
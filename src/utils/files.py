@@ -0,0 +1,197 @@
+import mmap
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from src.utils.modes import MODES, BlockCipher, Mode, decrypt_cbc, encrypt_cbc, pad, process_ctr, unpad
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+Bounds = Tuple[int, int]
+
+
+class _Job(NamedTuple):
+    cipher: BlockCipher
+    mode: Mode
+    iv: int
+    is_decryption: bool
+    input_path: str
+    output_path: str
+
+
+# Every worker maps the input file and opens the output file once; the chunks are read from the mapping
+# and written straight to their offsets in the output file, so no text goes through the pool's pipes.
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(job: _Job) -> None:
+    with open(job.input_path, 'rb') as input_file:
+        _worker_state['input'] = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    _worker_state['output'] = os.open(job.output_path, os.O_WRONLY)
+    _worker_state['job'] = job
+
+
+def _close_worker() -> None:
+    _worker_state.pop('input').close()
+    os.close(_worker_state.pop('output'))
+    _worker_state.pop('job')
+
+
+def _process_chunk(bounds: Bounds) -> None:
+    start, stop = bounds
+    job: _Job = _worker_state['job']
+    source = _worker_state['input']
+    cipher = job.cipher
+    block_size = cipher.block_size
+    text = source[start:stop]
+
+    if job.mode == 'CTR':
+        processed_text = process_ctr(cipher, text, job.iv, start // block_size)
+    elif job.mode == 'ECB':
+        processed_text = cipher.decrypt(text) if job.is_decryption else cipher.encrypt(text)
+    else:
+        # Decryption of a CBC chunk only needs the last ciphertext block of the previous chunk.
+        iv = int.from_bytes(source[(start - block_size):start], byteorder='big') if start else job.iv
+        processed_text = decrypt_cbc(cipher, text, iv)
+
+    os.pwrite(_worker_state['output'], processed_text, start)
+
+
+def _encrypt_cbc_chunks(chunks: List[Bounds]) -> int:
+    job: _Job = _worker_state['job']
+    iv = job.iv
+    for start, stop in chunks:
+        encrypted_text = encrypt_cbc(job.cipher, _worker_state['input'][start:stop], iv)
+        os.pwrite(_worker_state['output'], encrypted_text, start)
+        iv = int.from_bytes(encrypted_text[-job.cipher.block_size:], byteorder='big')
+
+    return iv
+
+
+def _run(job: _Job, chunks: List[Bounds], processes: int) -> int:
+    # Returns the chaining value after the chunks (only meaningful for CBC encryption).
+    if not chunks:
+        return job.iv
+
+    if job.mode == 'CBC' and not job.is_decryption:
+        # Every CBC block depends on the previous ciphertext block, so the encryption can't be split.
+        with ExitStack() as stack:
+            _init_worker(job)
+            stack.callback(_close_worker)
+            return _encrypt_cbc_chunks(chunks)
+
+    # The results are consumed only to re-raise the errors of the workers.
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(job,)) as executor:
+        deque(executor.map(_process_chunk, chunks), maxlen=0)
+
+    return job.iv
+
+
+def _remove_padding(path: str, size: int, block_size: int) -> None:
+    with open(path, 'rb') as output_file:
+        output_file.seek(size - block_size)
+        last_block = output_file.read(block_size)
+
+    try:
+        last_block = unpad(last_block, block_size)
+    except ValueError:
+        # The file is a decryption of data that failed the check, so it isn't left behind.
+        os.unlink(path)
+        raise
+
+    os.truncate(path, size - block_size + len(last_block))
+
+
+def _process_file(
+    job: _Job,
+    processes: Optional[int],
+    chunk_size: int,
+) -> None:
+    block_size = job.cipher.block_size
+    aligned_chunk_size = chunk_size - chunk_size % block_size
+    if aligned_chunk_size <= 0:
+        raise ValueError('The chunk size must be at least one block.')
+
+    size = os.path.getsize(job.input_path)
+    is_padded = job.mode != 'CTR'
+    if is_padded and job.is_decryption and (size == 0 or size % block_size != 0):
+        raise ValueError('The encrypted file must consist of whole blocks.')
+
+    # With padding the incomplete last block of the plaintext is encrypted after all the other chunks.
+    length = size - size % block_size if is_padded and not job.is_decryption else size
+    with open(job.output_path, 'wb') as created_file:
+        created_file.truncate(length)
+
+    chunks = [(start, min(start + aligned_chunk_size, length)) for start in range(0, length, aligned_chunk_size)]
+    iv = _run(job, chunks, processes or os.cpu_count() or 1)
+
+    if not is_padded:
+        return
+
+    if job.is_decryption:
+        _remove_padding(job.output_path, size, block_size)
+        return
+
+    with open(job.output_path, 'r+b') as output_file:
+        with open(job.input_path, 'rb') as input_file:
+            input_file.seek(length)
+            tail = pad(input_file.read(), block_size)
+
+        output_file.seek(length)
+        output_file.write(encrypt_cbc(job.cipher, tail, iv) if job.mode == 'CBC' else job.cipher.encrypt(tail))
+
+
+def _prepare_job(
+    cipher: BlockCipher,
+    mode: Mode,
+    iv: Optional[bytes],
+    input_path: str,
+    output_path: str,
+    *,
+    is_decryption: bool,
+) -> _Job:
+    if mode not in MODES:
+        raise ValueError(f'Unknown mode: {mode}.')
+
+    if mode == 'ECB' and iv is not None:
+        raise ValueError('ECB mode does not use an IV.')
+
+    if mode != 'ECB' and (iv is None or len(iv) != cipher.block_size):
+        raise ValueError(f'The IV must be {cipher.block_size} bytes long.')
+
+    return _Job(cipher, mode, int.from_bytes(iv or b'', byteorder='big'), is_decryption, input_path, output_path)
+
+
+def encrypt_file(
+    input_path: str,
+    output_path: str,
+    cipher: BlockCipher,
+    mode: Mode = 'ECB',
+    iv: Optional[bytes] = None,
+    *,
+    processes: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Optional[bytes]:
+    if mode != 'ECB' and iv is None:
+        iv = os.urandom(cipher.block_size)
+
+    job = _prepare_job(cipher, mode, iv, input_path, output_path, is_decryption=False)
+    _process_file(job, processes, chunk_size)
+    return iv
+
+
+def decrypt_file(
+    input_path: str,
+    output_path: str,
+    cipher: BlockCipher,
+    mode: Mode = 'ECB',
+    iv: Optional[bytes] = None,
+    *,
+    processes: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> None:
+    job = _prepare_job(cipher, mode, iv, input_path, output_path, is_decryption=True)
+    _process_file(job, processes, chunk_size)
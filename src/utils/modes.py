@@ -0,0 +1,118 @@
+from typing import Literal, Protocol
+
+Mode = Literal['ECB', 'CBC', 'CTR']
+
+MODES = ('ECB', 'CBC', 'CTR')
+
+
+class BlockCipher(Protocol):
+    block_size: int
+
+    def encrypt_block(self, block: int) -> int:
+        raise NotImplementedError
+
+    def decrypt_block(self, block: int) -> int:
+        raise NotImplementedError
+
+    def encrypt(self, text: bytes) -> bytes:
+        raise NotImplementedError
+
+    def decrypt(self, text: bytes) -> bytes:
+        raise NotImplementedError
+
+
+def pad(text: bytes, block_size: int) -> bytes:
+    padding_length = block_size - len(text) % block_size
+    return text + bytes([padding_length]) * padding_length
+
+
+def unpad(text: bytes, block_size: int) -> bytes:
+    if not text or len(text) % block_size != 0:
+        raise ValueError('The padded text must consist of whole blocks.')
+
+    padding_length = text[-1]
+    if padding_length == 0 or padding_length > block_size:
+        raise ValueError('Invalid padding.')
+
+    if text[-padding_length:] != bytes([padding_length]) * padding_length:
+        raise ValueError('Invalid padding.')
+
+    return text[:-padding_length]
+
+
+def encrypt_cbc(cipher: BlockCipher, text: bytes, iv: int) -> bytes:
+    block_size = cipher.block_size
+    encrypted_text = bytearray()
+    for start in range(0, len(text), block_size):
+        iv = cipher.encrypt_block(int.from_bytes(text[start:(start + block_size)], byteorder='big') ^ iv)
+        encrypted_text += iv.to_bytes(block_size, byteorder='big')
+
+    return bytes(encrypted_text)
+
+
+def decrypt_cbc(cipher: BlockCipher, text: bytes, iv: int) -> bytes:
+    block_size = cipher.block_size
+    decrypted_text = bytearray()
+    for start in range(0, len(text), block_size):
+        block = int.from_bytes(text[start:(start + block_size)], byteorder='big')
+        decrypted_text += (cipher.decrypt_block(block) ^ iv).to_bytes(block_size, byteorder='big')
+        iv = block
+
+    return bytes(decrypted_text)
+
+
+def process_ctr(cipher: BlockCipher, text: bytes, nonce: int, start_block: int = 0) -> bytes:
+    # Every block only depends on its own counter, so any range of blocks can be processed independently
+    # (and in parallel) as long as start_block is the index of its first block in the stream.
+    block_size = cipher.block_size
+    counter_mask = (1 << (8 * block_size)) - 1
+    processed_text = bytearray()
+    for index, start in enumerate(range(0, len(text), block_size), start=start_block):
+        chunk = text[start:(start + block_size)]
+        keystream = cipher.encrypt_block((nonce + index) & counter_mask) >> (8 * (block_size - len(chunk)))
+        processed_text += (int.from_bytes(chunk, byteorder='big') ^ keystream).to_bytes(len(chunk), byteorder='big')
+
+    return bytes(processed_text)
+
+
+class StreamCipher:
+    # The text is buffered so that _process always gets whole blocks, the rest of it is left for _finalize.
+    def __init__(self, block_size: int):
+        self.block_size = block_size
+        self._buffer = b''
+        self._is_finalized = False
+
+    def update(self, text: bytes) -> bytes:
+        if self._is_finalized:
+            raise ValueError('The cipher has already been finalized.')
+
+        # Only whole blocks are processed, so the chunks of the stream may have any length.
+        self._buffer += text
+        ready_length = len(self._buffer) - len(self._buffer) % self.block_size
+        if self._keeps_last_block() and ready_length == len(self._buffer):
+            ready_length -= self.block_size
+
+        if ready_length <= 0:
+            return b''
+
+        ready = self._buffer[:ready_length]
+        self._buffer = self._buffer[ready_length:]
+        return self._process(ready)
+
+    def finalize(self) -> bytes:
+        if self._is_finalized:
+            raise ValueError('The cipher has already been finalized.')
+
+        self._is_finalized = True
+        tail = self._buffer
+        self._buffer = b''
+        return self._finalize(tail)
+
+    def _keeps_last_block(self) -> bool:
+        return False
+
+    def _process(self, text: bytes) -> bytes:
+        raise NotImplementedError
+
+    def _finalize(self, tail: bytes) -> bytes:
+        return self._process(tail)
@@ -0,0 +1,120 @@
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from typing import Callable, Dict, NamedTuple, Optional, Sequence, Tuple
+
+Table = Tuple[Tuple[int, ...], ...]
+TableBuilder = Callable[[], Sequence[Sequence[int]]]
+
+CACHE_DIRECTORY_VARIABLE = 'TABLE_CACHE_DIRECTORY'
+
+# The version of the builder, the number of rows and the length of a row.
+_HEADER = struct.Struct('<III')
+
+
+class _Entry(NamedTuple):
+    builder: TableBuilder
+    typecode: str
+    version: int
+
+
+_entries: Dict[str, _Entry] = {}
+_tables: Dict[str, Table] = {}
+_settings: Dict[str, Optional[str]] = {'cache_directory': os.environ.get(CACHE_DIRECTORY_VARIABLE)}
+
+
+def register_table(name: str, typecode: str, version: int = 1) -> Callable[[TableBuilder], TableBuilder]:
+    # A table is a sequence of rows of the same length; typecode is the array typecode of its items.
+    # The version is stored in the cache file, so it must change whenever the builder changes.
+    def decorator(builder: TableBuilder) -> TableBuilder:
+        if name in _entries:
+            raise ValueError(f'The table {name} is already registered.')
+
+        _entries[name] = _Entry(builder, typecode, version)
+        return builder
+
+    return decorator
+
+
+def get_table(name: str) -> Table:
+    # Tables are built on the first use, so importing an engine costs nothing until it runs.
+    table = _tables.get(name)
+    if table is None:
+        table = _load_table(name)
+        _tables[name] = table
+
+    return table
+
+
+def set_cache_directory(directory: Optional[str]) -> None:
+    _settings['cache_directory'] = directory
+
+
+def clear_tables() -> None:
+    _tables.clear()
+
+
+def _get_cache_path(name: str) -> Optional[str]:
+    directory = _settings['cache_directory']
+    if directory is None:
+        return None
+
+    # The items are stored in the native byte order.
+    return os.path.join(directory, f'{name}.{_entries[name].typecode}.{sys.byteorder}.bin')
+
+
+def _load_table(name: str) -> Table:
+    if name not in _entries:
+        raise ValueError(f'Unknown table: {name}.')
+
+    entry = _entries[name]
+    path = _get_cache_path(name)
+    table = _read_table(path, entry) if path is not None and os.path.exists(path) else None
+    if table is not None:
+        return table
+
+    table = tuple(tuple(row) for row in entry.builder())
+    if path is not None:
+        _write_table(path, table, entry)
+
+    return table
+
+
+def _read_table(path: str, entry: _Entry) -> Optional[Table]:
+    # A truncated file or a file of another builder is rebuilt instead of being served.
+    if os.path.getsize(path) < _HEADER.size:
+        return None
+
+    with open(path, 'rb') as cache_file:
+        with mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            version, rows_number, row_length = _HEADER.unpack_from(mapping)
+            size = _HEADER.size + rows_number * row_length * array(entry.typecode).itemsize
+            if version != entry.version or len(mapping) != size:
+                return None
+
+            numbers = memoryview(mapping)[_HEADER.size:].cast(entry.typecode)
+            # The rows are copied into tuples: indexing a tuple is faster than indexing a memoryview
+            # in the hot loops of the engines.
+            table = tuple(tuple(numbers[(i * row_length):((i + 1) * row_length)]) for i in range(rows_number))
+            numbers.release()
+
+    return table
+
+
+def _write_table(path: str, table: Table, entry: _Entry) -> None:
+    row_length = len(table[0]) if table else 0
+    if any(len(row) != row_length for row in table):
+        raise ValueError('The rows of a table must have the same length.')
+
+    # The file is written under a temporary name and then renamed, so concurrent processes never read
+    # a partially written table.
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    with os.fdopen(descriptor, 'wb') as cache_file:
+        cache_file.write(_HEADER.pack(entry.version, len(table), row_length))
+        cache_file.write(array(entry.typecode, (number for row in table for number in row)).tobytes())
+
+    os.replace(temporary_path, path)